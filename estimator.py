@@ -1,50 +1,272 @@
 # estimator.py
 # Simple estimator functions for minor project
+# paint_estimate / tiles_estimate also accept NumPy arrays (one value per room)
+from functools import lru_cache
+import warnings
+import numpy as np
 
-def paint_estimate(wall_area_m2, coverage=10.0, coats=2, wastage=0.1, price_per_litre=250.0):
+# Scalar estimators: plain Python (sub-microsecond per call; no JIT dispatch, same float
+# results as the original formulas). Numba is only used by quote_rooms, see _quote_kernel().
+def _paint_scalar(wall_area_m2, coverage, coats, wastage, price_per_litre):
+    if wall_area_m2 <= 0:
+        return 0.0, 0.0
+    litres = (wall_area_m2 / coverage) * coats * (1 + wastage)
+    return litres, litres * price_per_litre
+
+def _paint_vec(wall_area_m2, coverage, coats, wastage, price_per_litre):
+    a = np.asarray(wall_area_m2, dtype=np.float64)
+    litres = np.where(a <= 0, 0.0, (a / coverage) * coats * (1.0 + wastage))
+    return litres, litres * price_per_litre
+
+def paint_estimate_raw(wall_area_m2, coverage=10.0, coats=2, wastage=0.1, price_per_litre=250.0):
     """
-    wall_area_m2: area to paint (m2)
+    wall_area_m2: area to paint (m2), or np.ndarray of areas
     coverage: m2 per litre
     coats: number of coats
     wastage: fraction e.g., 0.1 for 10%
     price_per_litre: ₹ per litre
-    Returns: (litres_needed, material_cost)
+    Returns: (litres_needed, material_cost), unrounded — arrays if wall_area_m2 is an array
     """
-    if wall_area_m2 <= 0:
+    if isinstance(wall_area_m2, np.ndarray):
+        return _paint_vec(wall_area_m2, coverage, coats, wastage, price_per_litre)
+    return _paint_scalar(wall_area_m2, coverage, coats, wastage, price_per_litre)
+
+def _tiles_scalar(floor_area_m2, wastage, rate_per_m2):
+    if floor_area_m2 <= 0:
         return 0.0, 0.0
-    litres = (wall_area_m2 / coverage) * coats * (1 + wastage)
-    material_cost = litres * price_per_litre
-    return round(litres, 2), round(material_cost, 2)
+    qty = floor_area_m2 * (1 + wastage)
+    return qty, qty * rate_per_m2
+
+def _tiles_vec(floor_area_m2, wastage, rate_per_m2):
+    a = np.asarray(floor_area_m2, dtype=np.float64)
+    qty = np.where(a <= 0, 0.0, a * (1.0 + wastage))
+    return qty, qty * rate_per_m2
 
-def tiles_estimate(floor_area_m2, wastage=0.05, rate_per_m2=600.0):
+def tiles_estimate_raw(floor_area_m2, wastage=0.05, rate_per_m2=600.0):
     """
-    floor_area_m2: area of floor
+    floor_area_m2: area of floor, or np.ndarray of areas
     wastage: fraction
     rate_per_m2: ₹ per m2 of tiles (material)
-    Returns: (area_with_wastage, material_cost)
+    Returns: (area_with_wastage, material_cost), unrounded — arrays if floor_area_m2 is an array
     """
-    if floor_area_m2 <= 0:
-        return 0.0, 0.0
-    qty = floor_area_m2 * (1 + wastage)
-    cost = qty * rate_per_m2
-    return round(qty, 2), round(cost, 2)
+    if isinstance(floor_area_m2, np.ndarray):
+        return _tiles_vec(floor_area_m2, wastage, rate_per_m2)
+    return _tiles_scalar(floor_area_m2, wastage, rate_per_m2)
 
-def plumbing_estimate(num_points=1, base_charge=500.0, per_point=300.0):
+def plumbing_estimate_raw(num_points=1, base_charge=500.0, per_point=300.0):
     """
     num_points: number of plumbing points (taps, fittings)
     base_charge: fixed callout
     per_point: per-point labour/material estimate
-    Returns: total_cost
+    Returns: total_cost, unrounded
     """
     if num_points <= 0:
         return 0.0
-    total = base_charge + (num_points * per_point)
-    return round(total, 2)
+    return float(base_charge + (num_points * per_point))
 
-def generic_labour(area_m2, labour_rate_per_m2=30.0):
+def generic_labour_raw(area_m2, labour_rate_per_m2=30.0):
     """
-    Simple labour estimate by area
+    Simple labour estimate by area (unrounded)
     """
     if area_m2 <= 0:
         return 0.0
-    return round(area_m2 * labour_rate_per_m2, 2)
+    return float(area_m2 * labour_rate_per_m2)
+
+# ---------------- Array APIs (unrounded; one value per room / unit) ----------------
+def paint_estimate_vec(wall_areas, coverage=10.0, coats=2, wastage=0.1, price_per_litre=250.0):
+    return _paint_vec(wall_areas, coverage, coats, wastage, price_per_litre)
+
+def tiles_estimate_vec(floor_areas, wastage=0.05, rate_per_m2=600.0):
+    return _tiles_vec(floor_areas, wastage, rate_per_m2)
+
+def plumbing_estimate_vec(num_points, base_charge=500.0, per_point=300.0):
+    # float points, like plumbing_estimate (2.5 points -> base + 2.5 * per_point, not truncated)
+    n = np.asarray(num_points, dtype=np.float64)
+    out = base_charge + n * per_point
+    np.copyto(out, 0.0, where=n <= 0)
+    return out
+
+def generic_labour_vec(areas, labour_rate_per_m2=30.0):
+    a = np.asarray(areas, dtype=np.float64)
+    return np.where(a > 0, a * labour_rate_per_m2, 0.0)
+
+def plumbing_estimate_batch(num_points, base_charge=500.0, per_point=300.0):
+    """
+    num_points: np.ndarray (or list) of plumbing points, one entry per unit
+    base_charge: fixed callout per unit
+    per_point: per-point labour/material estimate
+    Returns: np.ndarray of total_cost per unit (rounded); a float for scalar input
+    """
+    if np.ndim(num_points) == 0:
+        return plumbing_estimate_rounded(num_points, base_charge, per_point)
+    out = plumbing_estimate_vec(num_points, base_charge, per_point)
+    np.round(out, 2, out=out)
+    return out
+
+# ---------------- Rounded wrappers (2 d.p., for display / storage) ----------------
+def _round_pair(pair):
+    a, b = pair
+    if isinstance(a, np.ndarray):
+        np.round(a, 2, out=a)
+        np.round(b, 2, out=b)
+        return a, b
+    return round(a, 2), round(b, 2)
+
+# Memoized paths: areas on a 0.1 m2 grid, wastage in basis points, prices in paise.
+# Only used when the quantized value maps back to the caller's float exactly,
+# so cached and uncached results are identical.
+def _on_grid(x, scale):
+    try:
+        q = round(x * scale)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return q if q / scale == x else None
+
+@lru_cache(maxsize=4096)
+def _paint_cached(wall_area_q, coverage, coats, wastage_bp, price_paise):
+    return _round_pair(_paint_scalar(wall_area_q / 10, coverage, coats, wastage_bp / 10000, price_paise / 100))
+
+@lru_cache(maxsize=4096)
+def _tiles_cached(floor_area_q, wastage_bp, rate_paise):
+    return _round_pair(_tiles_scalar(floor_area_q / 10, wastage_bp / 10000, rate_paise / 100))
+
+def paint_estimate_rounded(wall_area_m2, coverage=10.0, coats=2, wastage=0.1, price_per_litre=250.0):
+    if isinstance(wall_area_m2, np.ndarray):
+        return _round_pair(_paint_vec(wall_area_m2, coverage, coats, wastage, price_per_litre))
+    wa_q = _on_grid(wall_area_m2, 10)
+    # zero/negative areas are a plain guard — not worth a cache slot; off-grid areas skip
+    # the remaining checks so the uncached path stays cheap
+    if wa_q and wa_q > 0:
+        wastage_bp = _on_grid(wastage, 10000)
+        price_paise = _on_grid(price_per_litre, 100)
+        if wastage_bp is not None and price_paise is not None:
+            return _paint_cached(wa_q, coverage, coats, wastage_bp, price_paise)
+    litres, cost = _paint_scalar(wall_area_m2, coverage, coats, wastage, price_per_litre)
+    return round(litres, 2), round(cost, 2)
+
+def tiles_estimate_rounded(floor_area_m2, wastage=0.05, rate_per_m2=600.0):
+    if isinstance(floor_area_m2, np.ndarray):
+        return _round_pair(_tiles_vec(floor_area_m2, wastage, rate_per_m2))
+    fa_q = _on_grid(floor_area_m2, 10)
+    if fa_q and fa_q > 0:
+        wastage_bp = _on_grid(wastage, 10000)
+        rate_paise = _on_grid(rate_per_m2, 100)
+        if wastage_bp is not None and rate_paise is not None:
+            return _tiles_cached(fa_q, wastage_bp, rate_paise)
+    qty, cost = _tiles_scalar(floor_area_m2, wastage, rate_per_m2)
+    return round(qty, 2), round(cost, 2)
+
+def plumbing_estimate_rounded(num_points=1, base_charge=500.0, per_point=300.0):
+    return round(plumbing_estimate_raw(num_points, base_charge, per_point), 2)
+
+def generic_labour_rounded(area_m2, labour_rate_per_m2=30.0):
+    return round(generic_labour_raw(area_m2, labour_rate_per_m2), 2)
+
+# original names keep returning rounded values
+paint_estimate = paint_estimate_rounded
+tiles_estimate = tiles_estimate_rounded
+plumbing_estimate = plumbing_estimate_rounded
+generic_labour = generic_labour_rounded
+
+# ---------------- Fused per-room quote (all four estimators in one pass) ----------------
+# params layout for quote_rooms / _quote_room_kernel
+QUOTE_PARAMS = np.array([
+    10.0,    # 0 paint coverage (m2 per litre)
+    2.0,     # 1 coats
+    0.1,     # 2 paint wastage
+    250.0,   # 3 price per litre
+    0.05,    # 4 tile wastage
+    600.0,   # 5 tile rate per m2
+    500.0,   # 6 plumbing base charge
+    300.0,   # 7 plumbing per point
+    30.0,    # 8 labour rate per m2
+])
+# output columns of quote_rooms
+QUOTE_COLUMNS = ('litres', 'paint_cost', 'tile_qty', 'tile_cost', 'plumb_cost', 'labour_cost')
+
+def _quote_room_kernel(wall_area, floor_area, num_points, params, cols, out):
+    litres = 0.0
+    paint_cost = 0.0
+    if wall_area > 0:
+        litres = (wall_area / params[0]) * params[1] * (1.0 + params[2])
+        paint_cost = litres * params[3]
+    tile_qty = 0.0
+    tile_cost = 0.0
+    if floor_area > 0:
+        tile_qty = floor_area * (1.0 + params[4])
+        tile_cost = tile_qty * params[5]
+    plumb_cost = 0.0
+    if num_points > 0:
+        plumb_cost = params[6] + num_points * params[7]
+    # clamp each term: a negative wall area must not cancel out floor labour
+    labour_area = max(wall_area, 0.0) + max(floor_area, 0.0)
+    labour_cost = 0.0
+    if labour_area > 0:
+        labour_cost = labour_area * params[8]
+    out[0] = litres
+    out[1] = paint_cost
+    out[2] = tile_qty
+    out[3] = tile_cost
+    out[4] = plumb_cost
+    out[5] = labour_cost
+
+def _quote_rooms_np(wall, floor, pts, params):
+    out = np.empty(np.broadcast(wall, floor, pts).shape + (len(QUOTE_COLUMNS),))
+    out[..., 0] = np.where(wall > 0, (wall / params[0]) * params[1] * (1.0 + params[2]), 0.0)
+    out[..., 1] = out[..., 0] * params[3]
+    out[..., 2] = np.where(floor > 0, floor * (1.0 + params[4]), 0.0)
+    out[..., 3] = out[..., 2] * params[5]
+    out[..., 4] = np.where(pts > 0, params[6] + pts * params[7], 0.0)
+    area = np.maximum(wall, 0.0) + np.maximum(floor, 0.0)
+    out[..., 5] = np.where(area > 0, area * params[8], 0.0)
+    return out
+
+# Numba (optional) is imported and the gufunc compiled on the first quote_rooms call, not at
+# import: that costs ~0.5 s, which app startup and the scalar estimators shouldn't pay.
+_quote_gufunc = None   # None = not built yet, False = unavailable (NumPy path)
+
+def _quote_kernel():
+    global _quote_gufunc
+    if _quote_gufunc is None:
+        try:
+            from numba import guvectorize, float64
+            # `cols` is a dummy length-6 input: gufunc output sizes must come from an input dimension
+            k = guvectorize([(float64, float64, float64, float64[:], float64[:], float64[:])],
+                            '(),(),(),(p),(k)->(k)', nopython=True, cache=True)(_quote_room_kernel)
+            # parity check: the compiled kernel must reproduce the pure-Python formulas exactly
+            # the trailing pairs mix signs to exercise the per-term labour clamp
+            wall = np.array([-1.0, 0.0, 0.1, 7.3, 12.5, 72.3, 333.3, 1e6, -1.0, 2.0, -5.0])
+            floor = np.concatenate([wall[7::-1], [2.0, -1.0, 3.0]])
+            pts = np.array([-1.0, 0.0, 1.0, 2.0, 2.5, 2.7, 10.0, 1000.0, 0.0, 1.0, -2.0])
+            p = QUOTE_PARAMS
+            want = np.array([_paint_scalar(w, p[0], p[1], p[2], p[3]) + _tiles_scalar(f, p[4], p[5])
+                             + (plumbing_estimate_raw(n, p[6], p[7]), generic_labour_raw(max(w, 0.0) + max(f, 0.0), p[8]))
+                             for w, f, n in zip(wall.tolist(), floor.tolist(), pts.tolist())])
+            if not np.array_equal(k(wall, floor, pts, p, np.zeros(len(QUOTE_COLUMNS))), want):
+                warnings.warn("quote_rooms: compiled kernel disagrees with the scalar formulas; using NumPy.",
+                              RuntimeWarning)
+                k = False
+        except Exception:
+            k = False
+        _quote_gufunc = k
+    return _quote_gufunc or None
+
+def quote_rooms(wall_areas, floor_areas, num_points, params=QUOTE_PARAMS):
+    """
+    wall_areas: paint area per room (m2)
+    floor_areas: tile area per room (m2)
+    num_points: plumbing points per room
+    params: float64 array laid out like QUOTE_PARAMS
+    Returns: (N, 6) array of unrounded values, columns as in QUOTE_COLUMNS
+    """
+    wall = np.asarray(wall_areas, dtype=np.float64)
+    floor = np.asarray(floor_areas, dtype=np.float64)
+    pts = np.asarray(num_points, dtype=np.float64)   # float, like the scalar estimators
+    params = np.asarray(params, dtype=np.float64)
+    # the compiled kernel indexes params without bounds checks: a short array would read garbage
+    if params.shape != QUOTE_PARAMS.shape:
+        raise ValueError(f"params must have shape {QUOTE_PARAMS.shape} (see QUOTE_PARAMS), got {params.shape}")
+    kernel = _quote_kernel()
+    if kernel is None:
+        return _quote_rooms_np(wall, floor, pts, params)
+    return kernel(wall, floor, pts, params, np.zeros(len(QUOTE_COLUMNS)))
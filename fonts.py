@@ -0,0 +1,15 @@
+"""Shared Pillow font loading: each (candidates, size) pair is parsed once per process."""
+from functools import lru_cache
+
+from PIL import ImageFont
+
+
+@lru_cache(maxsize=8)
+def get_font(path_candidates, size):
+    # candidates are tried in order; bare names are resolved by FreeType against the system font folders
+    for p in path_candidates:
+        try:
+            return ImageFont.truetype(p, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
@@ -8,31 +8,82 @@ Full main.py (drop-in replacement). Includes Worker Log feature:
 """
 import os
 import json
+import math
 import sqlite3
 import csv
 import shutil
+import hashlib
+import threading
 import time
 from datetime import datetime
+from functools import lru_cache
 
-# Optional ML loaders
+# NumPy (optional)
 try:
-    import joblib
+    import numpy as np
 except Exception:
-    joblib = None
+    np = None
 
-# Pillow (optional but recommended)
+# orjson (optional) — several times faster than stdlib json
 try:
-    from PIL import Image as PILImage, ImageDraw, ImageFont
+    import orjson
+    def _json_loads(data):
+        return orjson.loads(data)
+    def _json_dumps(obj):
+        return orjson.dumps(obj)
 except Exception:
-    PILImage = None
-    ImageDraw = None
-    ImageFont = None
+    orjson = None
+    def _json_loads(data):
+        return json.loads(data)
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+# joblib / pandas / Pillow are heavy: imported on first use via _joblib() / _pandas() / _pil().
+# None = not tried yet, False = not installed.
+joblib = None
+pd = None
+PILImage = None
+ImageDraw = None
+
+def _joblib():
+    global joblib
+    if joblib is None:
+        try:
+            import joblib as mod
+        except Exception:
+            mod = False
+        joblib = mod
+    return joblib or None
+
+def _pandas():
+    global pd
+    if pd is None:
+        try:
+            import pandas as mod
+        except Exception:
+            mod = False
+        pd = mod
+    return pd or None
+
+def _pil():
+    """Import Pillow on first use; returns PILImage (None if missing) and fills ImageDraw."""
+    global PILImage, ImageDraw
+    if PILImage is None:
+        try:
+            from PIL import Image as mod, ImageDraw as draw_mod
+            ImageDraw = draw_mod
+        except Exception:
+            mod = False
+        PILImage = mod
+    return PILImage or None
 
 # Kivy imports
 from kivy.core.window import Window
 from kivy.lang import Builder
+from kivy.factory import Factory
 from kivy.app import App
-from kivy.properties import StringProperty
+from kivy.clock import Clock
+from kivy.properties import StringProperty, ObjectProperty, BooleanProperty
 from kivy.uix.popup import Popup
 from kivy.uix.label import Label
 from kivy.uix.button import Button
@@ -42,6 +93,10 @@ from kivy.uix.screenmanager import Screen
 from kivy.animation import Animation
 from kivy.uix.scatter import Scatter
 from kivy.graphics import Color, RoundedRectangle, Rectangle
+from kivy.graphics.texture import Texture
+from kivy.loader import Loader
+from kivy.core.text import Label as CoreLabel
+from kivy.core.image import Image as CoreImage
 
 # Desktop preview
 Window.size = (400, 800)
@@ -55,8 +110,19 @@ MODEL_PATH = os.path.join("models", "model.joblib")
 MATERIAL_MODEL_PATH = os.path.join("models", "material_model.joblib")
 RECORDS_CSV = os.path.join("data", "records.csv")
 UPLOADS_DIR = os.path.join(ASSETS_DIR, "uploads")
-PROV_AVATARS_DIR = os.path.join(ASSETS_DIR, "providers")
+# provider avatars: one strip of per-service discs + Kivy .atlas index (no extension here)
+AVATAR_ATLAS = os.path.join(ASSETS_DIR, "avatars_atlas")
+AVATAR_PX = 64
 WORKLOGS_CSV = os.path.join("data", "work_logs.csv")
+# IO buffer for CSV writes (Python's default is 8 KiB)
+BIG_BUF = 1 << 18
+# attached photos are stored as JPEG with this longest edge
+UPLOAD_MAX_PX = 1280
+# history thumbnails: app-owned JPEGs (never written next to the photo) bounded to this edge
+THUMBS_DIR = os.path.join(UPLOADS_DIR, "thumbs")
+THUMB_PX = 110
+# floor area covered by one box of tiles (purchase suggestion)
+BOX_COVER_M2 = 1.2
 
 # Ensure directories
 os.makedirs(ASSETS_DIR, exist_ok=True)
@@ -64,65 +130,274 @@ os.makedirs("data", exist_ok=True)
 os.makedirs(DB_DIR, exist_ok=True)
 os.makedirs("models", exist_ok=True)
 os.makedirs(UPLOADS_DIR, exist_ok=True)
-os.makedirs(PROV_AVATARS_DIR, exist_ok=True)
-
-# Estimator fallbacks if estimator.py missing
+os.makedirs(THUMBS_DIR, exist_ok=True)
+
+# SQLite: WAL journal, fsync only at checkpoints, temp tables in RAM, 20 MB page cache, 64 MB mmap
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=67108864",
+)
+
+# sqlite3 keeps this many compiled statements per connection; the app uses about a dozen distinct SQL strings
+DB_CACHED_STATEMENTS = 32
+
+def connect_db(**kwargs):
+    kwargs.setdefault('cached_statements', DB_CACHED_STATEMENTS)
+    conn = sqlite3.connect(DB_FILE, **kwargs)
+    for pragma in DB_PRAGMAS:
+        conn.execute(pragma)
+    # SR_SQL_TRACE=1 prints each statement as it runs (checks that hot paths only issue the constant strings)
+    if os.environ.get('SR_SQL_TRACE'):
+        conn.set_trace_callback(lambda sql: print("SQL:", sql))
+    return conn
+
+# Schema is created once at startup; the hot paths only run the prepared INSERT/SELECT strings below.
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS requests
+    (id INTEGER PRIMARY KEY AUTOINCREMENT, service TEXT, details TEXT, cost REAL, created_at TEXT, image TEXT);
+CREATE TABLE IF NOT EXISTS work_logs
+    (id INTEGER PRIMARY KEY AUTOINCREMENT, worker TEXT, completed TEXT, next_day TEXT, photo TEXT, created_at TEXT);
+CREATE TABLE IF NOT EXISTS visits
+    (id INTEGER PRIMARY KEY AUTOINCREMENT, customer TEXT, when_txt TEXT, address TEXT, created_at TEXT);
+CREATE TABLE IF NOT EXISTS amc
+    (id INTEGER PRIMARY KEY AUTOINCREMENT, customer TEXT, plan TEXT, created_at TEXT);
+"""
+INSERT_REQUEST_SQL = 'INSERT INTO requests (service, details, cost, created_at, image) VALUES (?,?,?,?,?)'
+INSERT_WORK_LOG_SQL = 'INSERT INTO work_logs (worker, completed, next_day, photo, created_at) VALUES (?,?,?,?,?)'
+INSERT_VISIT_SQL = 'INSERT INTO visits (customer, when_txt, address, created_at) VALUES (?,?,?,?)'
+INSERT_AMC_SQL = 'INSERT INTO amc (customer, plan, created_at) VALUES (?,?,?)'
+# newest first, paged (LIMIT -1 = all); id is the rowid, so ORDER BY id DESC is a plain backward scan
+SELECT_REQUESTS_SQL = 'SELECT service, details, cost, created_at, image FROM requests ORDER BY id DESC LIMIT ? OFFSET ?'
+SELECT_WORK_LOGS_SQL = 'SELECT worker, completed, next_day, photo, created_at FROM work_logs ORDER BY id DESC LIMIT ? OFFSET ?'
+SELECT_VISITS_SQL = 'SELECT customer, when_txt, address, created_at FROM visits ORDER BY id DESC LIMIT ? OFFSET ?'
+
+# Existence checks for app-managed files: one scandir per directory instead of a stat per probe.
+# Listings are cached; anything the app writes into them goes through _note_written().
+_DIR_LISTINGS = {}
+
+def _scan_names(d):
+    try:
+        return {e.name for e in os.scandir(d or '.')}
+    except OSError:
+        return set()
+
+def _cached_exists(path):
+    d, name = os.path.split(path)
+    names = _DIR_LISTINGS.get(d)
+    if names is None:
+        names = _DIR_LISTINGS[d] = _scan_names(d)
+    return name in names
+
+def _note_written(path):
+    d, name = os.path.split(path)
+    if d in _DIR_LISTINGS:
+        _DIR_LISTINGS[d].add(name)
+
+# the startup set, batched
+for _d in (ASSETS_DIR, "models", "data"):
+    _DIR_LISTINGS[_d] = _scan_names(_d)
+
+# Estimator fallbacks if estimator.py missing (raw = unrounded; format at display time).
 try:
-    from estimator import paint_estimate, tiles_estimate, plumbing_estimate, generic_labour
+    from estimator import paint_estimate_raw, tiles_estimate_raw, plumbing_estimate_raw, generic_labour_raw
 except Exception:
-    def paint_estimate(area, coverage=10.0, coats=2, wastage=0.1, price_per_litre=250.0):
+    def paint_estimate_raw(area, coverage=10.0, coats=2, wastage=0.1, price_per_litre=250.0):
         if area <= 0:
             return 0.0, 0.0
         litres = (area / coverage) * coats * (1 + wastage)
-        return round(litres, 2), round(litres * price_per_litre, 2)
+        return litres, litres * price_per_litre
 
-    def tiles_estimate(area, wastage=0.05, rate_per_m2=600.0):
+    def tiles_estimate_raw(area, wastage=0.05, rate_per_m2=600.0):
         if area <= 0:
             return 0.0, 0.0
         qty = area * (1 + wastage)
-        return round(qty, 2), round(qty * rate_per_m2, 2)
+        return qty, qty * rate_per_m2
 
-    def plumbing_estimate(points=1, base=500.0, per_point=300.0):
-        if points <= 0:
+    def plumbing_estimate_raw(num_points=1, base_charge=500.0, per_point=300.0):
+        if num_points <= 0:
             return 0.0
-        return round(base + points * per_point, 2)
+        return float(base_charge + num_points * per_point)
 
-    def generic_labour(area, labour_rate_per_m2=30.0):
+    def generic_labour_raw(area, labour_rate_per_m2=30.0):
         if area <= 0:
             return 0.0
-        return round(area * labour_rate_per_m2, 2)
+        return area * labour_rate_per_m2
 
-# ---------------- Gradient helper (create assets/bg_home.png) ----------------
-def ensure_home_gradient(path=os.path.join(ASSETS_DIR, "bg_home.png"),
-                         size=(720, 1280),
-                         top_color=(30, 200, 190),   # light teal RGB
-                         bottom_color=(12, 20, 40)): # dark navy RGB
+def _drop_page_cache(path):
+    """After writing an upload, write it back and let the kernel drop its cached pages (Linux/Android)."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fdatasync(fd)   # DONTNEED skips dirty pages
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        print("fadvise failed:", e)
+
+def ensure_avatar_atlas(colors, cell=AVATAR_PX):
+    """Draw one disc per service into AVATAR_ATLAS (.png + .atlas) if stale; returns {service: 'atlas://...' url}."""
+    png, index = AVATAR_ATLAS + ".png", AVATAR_ATLAS + ".atlas"
+    keys = {svc: svc.lower().replace(' ', '_') for svc in colors}
+    base = "atlas://" + AVATAR_ATLAS.replace(os.sep, '/') + "/"
+    urls = {svc: base + k for svc, k in keys.items()}
+    if _cached_exists(png) and _cached_exists(index) and os.path.getmtime(index) >= os.path.getmtime(__file__):
+        return urls
+    if _pil() is None:
+        return {}
+    img = PILImage.new("RGBA", (cell * len(colors), cell), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    regions = {}
+    for i, (svc, rgba) in enumerate(colors.items()):
+        x = i * cell
+        draw.ellipse((x, 0, x + cell - 1, cell - 1), fill=rgba)
+        regions[keys[svc]] = [x, 0, cell, cell]
+    img.save(png, "PNG")
+    with open(index, "wb") as f:
+        f.write(_json_dumps({os.path.basename(png): regions}))
+    _note_written(png); _note_written(index)
+    return urls
+
+def make_thumbnail(path):
     """
-    Create vertical gradient PNG at path if it does not exist. Returns path.
-    Uses Pillow if available; otherwise returns path (no crash).
+    Small JPEG of `path` under THUMBS_DIR (created once); returns `path` itself if one can't be made.
+    Stored photos may point outside the app (a failed upload copy keeps the user's own path), so the
+    thumbnail is named by a hash of the absolute path + mtime instead of living next to the photo.
     """
     try:
-        if os.path.exists(path):
-            return path
-        if PILImage is None or ImageDraw is None:
-            return path
-        W, H = size
-        img = PILImage.new("RGB", (W, H), bottom_color)
-        draw = ImageDraw.Draw(img)
-        top_r, top_g, top_b = top_color
-        bot_r, bot_g, bot_b = bottom_color
-        for y in range(H):
-            t = y / float(H - 1)
-            r = int(top_r * (1 - t) + bot_r * t)
-            g = int(top_g * (1 - t) + bot_g * t)
-            b = int(top_b * (1 - t) + bot_b * t)
-            draw.line([(0, y), (W, y)], fill=(r, g, b))
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        img.save(path, format="PNG", optimize=True)
+        st = os.stat(path)
+    except OSError:
         return path
+    key = hashlib.sha1(f"{os.path.abspath(path)}\0{st.st_mtime_ns}".encode('utf-8', 'surrogateescape')).hexdigest()
+    thumb = os.path.join(THUMBS_DIR, key + '.jpg')
+    if os.path.exists(thumb):
+        return thumb
+    if _pil() is None:
+        return path
+    try:
+        with PILImage.open(path) as im:
+            im.thumbnail((THUMB_PX, THUMB_PX))
+            im.convert('RGB').save(thumb, 'JPEG', quality=80)
+        return thumb
     except Exception as e:
-        print("Gradient creation failed:", e)
+        print("Thumbnail failed:", e)
         return path
+
+def read_csv_tail(path, n, skip=0, block=1 << 16):
+    """
+    Newest-first rows from the end of a CSV mirror without reading the whole file:
+    seeks back block by block and stops after skip + n lines. The header (first line) is never returned.
+    Assumes fields hold no embedded newlines (true for records.csv).
+    """
+    lines = []
+    try:
+        with open(path, 'rb') as f:
+            pos = f.seek(0, os.SEEK_END)
+            head, seen = b'', 0
+            while pos > 0 and len(lines) < n:
+                step = min(block, pos); pos -= step
+                f.seek(pos)
+                parts = (f.read(step) + head).split(b'\n')
+                head = parts.pop(0)   # partial line, or the header once pos reaches 0
+                for line in reversed(parts):
+                    if not line.strip():
+                        continue
+                    if seen >= skip:
+                        lines.append(line)
+                        if len(lines) >= n:
+                            break
+                    seen += 1
+    except OSError as e:
+        print("CSV tail read failed:", e)
+        return []
+    return [next(csv.reader([ln.decode('utf-8').rstrip('\r')])) for ln in lines]
+
+def _initial(name):
+    return ((name or '').strip()[:1] or "P").upper()
+
+# ---------------- Cached ML predictions ----------------
+# Loaded models by id(); the LRU key carries the int id so the sklearn object isn't hashed.
+# Models stay referenced here for the app's lifetime, so ids are never reused.
+_MODELS = {}
+# model id -> {service: int code} for estimators trained on a plain numeric matrix
+# (the model exposes it as `service_codes_`); those are fed a NumPy row, no pandas
+_SVC_CODES = {}
+
+def _register_model(model):
+    if model is not None:
+        _MODELS[id(model)] = model
+        codes = getattr(model, 'service_codes_', None)
+        if codes and np is not None:
+            _SVC_CODES[id(model)] = dict(codes)
+    return model
+
+def _model_rows(model_id, rows):
+    # rows of (svc, area, points, has_img) -> one input matrix, so a single predict() scores them all
+    # (tree ensembles pay most of a small predict in per-call overhead, not per row)
+    rows = list(rows)
+    codes = _SVC_CODES.get(model_id)
+    if codes is not None:
+        return np.array([[codes.get(svc, -1), area, points, 1 if img else 0] for svc, area, points, img in rows],
+                        dtype=np.float64)
+    # column dict is much cheaper than a list-of-dicts DataFrame
+    return _pandas().DataFrame({'service': [r[0] for r in rows], 'area': [r[1] for r in rows],
+                                'points': [r[2] for r in rows], 'image': [1 if r[3] else 0 for r in rows]})
+
+def _model_row(model_id, svc, area, points, has_img):
+    return _model_rows(model_id, [(svc, area, points, has_img)])
+
+def _predict_batch(model_id, rows):
+    return _MODELS[model_id].predict(_model_rows(model_id, rows))
+
+@lru_cache(maxsize=256)
+def _predict_cost(model_id, svc, area, points, has_img):
+    return float(_MODELS[model_id].predict(_model_row(model_id, svc, area, points, has_img))[0])
+
+@lru_cache(maxsize=256)
+def _predict_mat(model_id, svc, area, points, has_img):
+    mat_pred = _MODELS[model_id].predict(_model_row(model_id, svc, area, points, has_img))
+    return mat_pred[0] if hasattr(mat_pred, '__iter__') else mat_pred
+# ------------------------------------------------------------------------------
+
+# ---------------- Gradient helper (in-memory GPU texture) ----------------
+def make_gradient_texture(top_color=(30, 200, 190),   # light teal RGB
+                          bottom_color=(12, 20, 40),  # dark navy RGB
+                          steps=256):
+    """
+    Vertical gradient as a 1 x steps texture; the GPU stretches it with linear filtering.
+    Nothing is written to disk and no Pillow is needed. Needs a GL context (call from build()).
+    """
+    buf = bytearray()
+    for i in range(steps):
+        t = i / float(steps - 1)   # texture row 0 is the bottom
+        buf += bytes(int(bc * (1 - t) + tc * t) for bc, tc in zip(bottom_color, top_color))
+        buf.append(255)
+    tex = Texture.create(size=(1, steps), colorfmt='rgba')
+    tex.mag_filter = 'linear'
+    tex.min_filter = 'linear'
+    tex.blit_buffer(bytes(buf), colorfmt='rgba', bufferfmt='ubyte')
+    return tex
+
+@lru_cache(maxsize=128)
+def thumb_texture(path):
+    """One GL texture per thumbnail file, shared by every history row showing it (main thread only)."""
+    try:
+        return CoreImage(path, mipmap=False).texture
+    except Exception as e:
+        print("Thumbnail load failed:", e)
+        return None
+
+@lru_cache(maxsize=64)
+def initial_texture(ch, font_size=30):
+    """Avatar initial rendered once per glyph and shared by every AvatarBadge (main thread only)."""
+    lbl = CoreLabel(text=ch, font_size=font_size, bold=True, color=(1, 1, 1, 1))
+    lbl.refresh()
+    return lbl.texture
 # ------------------------------------------------------------------------------
 
 # KV UI
@@ -203,7 +478,87 @@ KV = r'''
             size: self.size
             radius: [14]
 
-ScreenManager:
+<CardBox@BoxLayout>:
+    bg_color: (0.12,0.12,0.14,1)
+    canvas.before:
+        Color:
+            rgba: self.bg_color
+        RoundedRectangle:
+            pos: self.pos
+            size: self.size
+            radius: [14]
+
+<AvatarBadge@RelativeLayout>:
+    source: ''
+    initial: ''
+    size_hint_x: None
+    width: 64
+    Image:
+        source: root.source
+    Image:
+        texture: app.initial_texture(root.initial) if root.initial else None
+
+<ProviderCard@CardBox>:
+    provider: {}
+    pid: None
+    pname: ''
+    pserv: ''
+    prat: 0.0
+    avatar: ''
+    initial: ''
+    phone: ''
+    orientation: 'horizontal'
+    padding: 10
+    spacing: 12
+    AvatarBadge:
+        source: root.avatar
+        initial: root.initial
+    Label:
+        text: '[b]%s[/b]\n%s  •  ⭐%s' % (root.pname, root.pserv, root.prat)
+        markup: True
+        halign: 'left'
+        valign: 'middle'
+        color: (0.95,0.95,0.98,1)
+        text_size: (200, None)
+    Button:
+        text: 'Details'
+        size_hint_x: None
+        width: 90
+        background_normal: ''
+        background_color: (0.25,0.25,0.25,1)
+        color: (1,1,1,1)
+        on_release: app.open_provider_details(root.provider)
+    Button:
+        text: 'Call'
+        size_hint_x: None
+        width: 80
+        background_normal: ''
+        background_color: app.aesthetic_teal
+        color: (1,1,1,1)
+        on_release: app.show_popup('Calling', 'Dialing %s...' % root.phone)
+
+<HistoryCard@CardBox>:
+    kind: ''
+    image: ''
+    thumb_w: 90
+    text: ''
+    orientation: 'horizontal'
+    padding: 10
+    spacing: 12
+    Image:
+        texture: app.thumb_texture(root.image) if root.image else None
+        size_hint_x: None
+        width: root.thumb_w if root.image else 0
+        opacity: 1 if root.image else 0
+    Label:
+        text: root.text
+        markup: True
+        halign: 'left'
+        valign: 'top'
+        color: (0.95,0.95,0.98,1)
+        text_size: (self.width, None)
+
+<RootManager@ScreenManager>:
     SplashScreen:
     HomeScreen:
     ServiceScreen:
@@ -252,7 +607,7 @@ ScreenManager:
             Rectangle:
                 pos: self.pos
                 size: self.size
-                source: app.home_bg if app.home_bg else ''
+                texture: app.home_bg
             Color:
                 rgba: (0,0,0,0.45)
             Rectangle:
@@ -523,7 +878,7 @@ ScreenManager:
                 id: prov_search
                 hint_text: 'Search providers by name or service'
                 multiline: False
-                on_text: app.filter_providers(self.text)
+                on_text: app.queue_filter_providers()
             Spinner:
                 id: prov_filter
                 text: 'All'
@@ -531,10 +886,19 @@ ScreenManager:
                 size_hint_x: None
                 width: dp(120)
                 on_text: app.filter_providers(prov_search.text, self.text)
-        ScrollView:
-            GridLayout:
-                id: prov_grid
-                cols: 1
+        Label:
+            text: 'Loading...'
+            color: (0.7,0.7,0.75,1)
+            size_hint_y: None
+            height: dp(24) if app.providers_loading else 0
+            opacity: 1 if app.providers_loading else 0
+        RecycleView:
+            id: prov_rv
+            viewclass: 'ProviderCard'
+            RecycleBoxLayout:
+                orientation: 'vertical'
+                default_size: None, 110
+                default_size_hint: 1, None
                 size_hint_y: None
                 height: self.minimum_height
                 spacing: dp(10)
@@ -557,10 +921,21 @@ ScreenManager:
                 pos: self.pos
                 size: self.size
         HeaderBar:
-        ScrollView:
-            GridLayout:
-                id: hist_grid
-                cols: 1
+        Label:
+            text: 'Loading...'
+            color: (0.7,0.7,0.75,1)
+            size_hint_y: None
+            height: dp(24) if app.history_loading else 0
+            opacity: 1 if app.history_loading else 0
+        RecycleView:
+            id: hist_rv
+            viewclass: 'HistoryCard'
+            on_scroll_y: app.history_scrolled(self)
+            RecycleBoxLayout:
+                orientation: 'vertical'
+                key_size: 'row_size'
+                default_size: None, 120
+                default_size_hint: 1, None
                 size_hint_y: None
                 height: self.minimum_height
                 spacing: dp(10)
@@ -617,6 +992,30 @@ ScreenManager:
                 on_release: app.select_file()
 '''
 
+# KV is written to a .kv file and its rules are loaded once per process;
+# every build() then just instantiates RootManager (no re-parse on hot reload / tests)
+KV_FILE = os.path.join(ASSETS_DIR, "ui.kv")
+_KV_LOADED = False
+
+def load_kv_rules():
+    global _KV_LOADED
+    if _KV_LOADED:
+        return
+    kv_file_ok = True
+    try:
+        if not _cached_exists(KV_FILE) or os.path.getmtime(KV_FILE) < os.path.getmtime(__file__):
+            with open(KV_FILE, 'w', encoding='utf-8') as f:
+                f.write(KV)
+            _note_written(KV_FILE)
+    except Exception as e:
+        print("Writing KV file failed, parsing inline:", e)
+        kv_file_ok = False
+    if kv_file_ok:
+        Builder.load_file(KV_FILE)
+    else:
+        Builder.load_string(KV)
+    _KV_LOADED = True
+
 # Screen classes referenced by KV
 class SplashScreen(Screen): pass
 class HomeScreen(Screen): pass
@@ -630,9 +1029,13 @@ class SmartApp(App):
     aesthetic_teal = (0.11, 0.63, 0.74, 1)
     current_image = StringProperty('')
     logo_path = StringProperty('')
-    home_bg = StringProperty('')
+    home_bg = ObjectProperty(None, allownone=True)
+    history_loading = BooleanProperty(False)
+    providers_loading = BooleanProperty(False)
     ml_model = None
     mat_model = None
+    HISTORY_PAGE = 50     # history rows fetched per page
+    CSV_SYNC_EVERY = 10   # rows written before the CSV mirrors are flushed + fsynced
 
     SERVICE_COLORS_KIVY = {
         'Painting':  (0.27, 0.52, 0.95, 1),
@@ -654,20 +1057,27 @@ class SmartApp(App):
     }
 
     def build(self):
+        try:
+            self._avatar_urls = ensure_avatar_atlas(self.SERVICE_COLORS_PIL)
+        except Exception as e:
+            print("Avatar atlas error:", e)
+            self._avatar_urls = {}
+        # providers.json is parsed by load_providers; filtering only reads this cache
+        self._set_providers(0, [])
         maybe_logo = os.path.join(ASSETS_DIR, "logo.png")
-        if os.path.exists(maybe_logo):
+        if _cached_exists(maybe_logo):
             self.logo_path = maybe_logo
-        # create gradient background (if possible) and set it
+        # gradient background drawn from a tiny in-memory texture
         try:
-            self.home_bg = ensure_home_gradient()
+            self.home_bg = make_gradient_texture()
         except Exception as e:
             print("Gradient helper error:", e)
-            self.home_bg = ''
+            self.home_bg = None
         # try to load models
-        self.ml_model = self.load_model(MODEL_PATH, name="cost model")
-        self.mat_model = self.load_model(MATERIAL_MODEL_PATH, name="material model (optional)")
+        self.ml_model = _register_model(self.load_model(MODEL_PATH, name="cost model"))
+        self.mat_model = _register_model(self.load_model(MATERIAL_MODEL_PATH, name="material model (optional)"))
         # seed providers if missing
-        if not os.path.exists(PROVIDERS_FILE):
+        if not _cached_exists(PROVIDERS_FILE):
             sample = [
                 {"id":1,"name":"Amit Electricals","service":"Electrical","rating":4.6,"phone":"9000000001","avg_charge":800},
                 {"id":2,"name":"Ravi Painters","service":"Painting","rating":4.4,"phone":"9000000002","avg_charge":2500},
@@ -676,23 +1086,124 @@ class SmartApp(App):
                 {"id":5,"name":"Cool AC Services","service":"AC Service","rating":4.7,"phone":"9000000005","avg_charge":900},
                 {"id":6,"name":"Modish Renovators","service":"Renovation","rating":4.2,"phone":"9000000006","avg_charge":15000}
             ]
-            with open(PROVIDERS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(sample, f, indent=2)
-        root = Builder.load_string(KV)
+            with open(PROVIDERS_FILE, 'wb') as f:
+                f.write(_json_dumps(sample))
+            _note_written(PROVIDERS_FILE)
+        load_kv_rules()
+        root = Factory.RootManager()
         self.animate_splash(root)
-        # optional smoke tests
-        if self.ml_model is not None:
+        # optional smoke test (forces pandas + sklearn load, so opt-in via SR_MODEL_SMOKE=1)
+        if self.ml_model is not None and os.environ.get('SR_MODEL_SMOKE'):
             try:
-                import pandas as _pd
-                _row = _pd.DataFrame([{'service':'Painting','area':50,'points':0,'image':0}])
-                _pred = float(self.ml_model.predict(_row)[0])
-                print("Cost model ok → Painting(50 m²): ₹", round(_pred,2))
+                # every known service in one batched predict call
+                _svcs = list(getattr(self.ml_model, 'service_codes_', None) or ['Painting'])
+                _preds = _predict_batch(id(self.ml_model), [(svc, 50, 0, False) for svc in _svcs])
+                print("Cost model ok → 50 m²: " + ", ".join(f"{svc} ₹{p:.2f}" for svc, p in zip(_svcs, _preds)))
             except Exception as e:
                 print("Cost model smoke failed:", e)
         if self.mat_model is not None:
             print("Material model loaded and ready.")
+        # one WAL connection for the app's lifetime; schema created once here
+        self._db = connect_db(check_same_thread=False)
+        self._db.row_factory = sqlite3.Row   # rows read by column name
+        self._db_lock = threading.Lock()   # reads also run on worker threads (see _run_bg)
+        self._ensure_schema()
+        # saves are queued and written in batches (see _flush_pending)
+        self._pending_records = []
+        self._pending_logs = []
+        self._csv_files = {}
+        self._csv_unsynced = 0
+        Clock.schedule_interval(self._flush_pending, 2.0)
+        # one-second clock shared by estimates and upload names
+        self._tick_now()
+        Clock.schedule_interval(self._tick_now, 1.0)
         return root
 
+    def _ensure_schema(self):
+        """All tables in one executescript at startup; no handler issues DDL."""
+        try:
+            with self._db_lock:
+                self._db.executescript(SCHEMA_SQL)
+        except Exception as e:
+            print("Schema setup failed:", e)
+
+    def _tick_now(self, *args):
+        now = datetime.now()
+        self._now_iso = now.isoformat(timespec='seconds')
+        self._now_ts = int(now.timestamp())
+
+    def on_pause(self):
+        # Android may kill a paused app without on_stop: get queued rows and CSV buffers onto disk now
+        self._flush_pending()
+        self._sync_csv()
+        return True
+
+    def on_stop(self):
+        self._flush_pending()
+        self._sync_csv()
+        for fh, _ in self._csv_files.values():
+            try:
+                fh.close()
+            except Exception:
+                pass
+        self._csv_files = {}
+        try:
+            self._db.close()
+        except Exception:
+            pass
+
+    def _sync_csv(self):
+        """flush + fsync the open CSV files (no-op when nothing was written since the last sync)."""
+        if not self._csv_unsynced:
+            return
+        for fh, _ in self._csv_files.values():
+            try:
+                fh.flush(); os.fsync(fh.fileno())
+            except Exception as e:
+                print("CSV sync failed:", e)
+        self._csv_unsynced = 0
+
+    def _csv_writer(self, path, header):
+        """Long-lived buffered csv.writer per file; header written when the file is new."""
+        entry = self._csv_files.get(path)
+        if entry is None:
+            write_header = not _cached_exists(path)
+            fh = open(path, 'a', newline='', encoding='utf-8', buffering=BIG_BUF)
+            _note_written(path)
+            w = csv.writer(fh)
+            if write_header:
+                w.writerow(header)
+            entry = self._csv_files[path] = (fh, w)
+        return entry[1]
+
+    def _flush_pending(self, *_):
+        """Write queued estimates / work logs: one transaction + executemany per table."""
+        recs, logs = self._pending_records, self._pending_logs
+        if not recs and not logs:
+            return
+        try:
+            with self._db_lock, self._db:
+                if recs:
+                    self._db.executemany(INSERT_REQUEST_SQL, [db_row for db_row, _ in recs])
+                if logs:
+                    self._db.executemany(INSERT_WORK_LOG_SQL, [db_row for db_row, _ in logs])
+        except Exception as e:
+            print("Batch DB write failed:", e)
+            return
+        self._pending_records, self._pending_logs = [], []
+        try:
+            if recs:
+                self._csv_writer(RECORDS_CSV, ['time', 'service', 'area', 'points', 'image', 'total']).writerows(
+                    [csv_row for _, csv_row in recs])
+            if logs:
+                self._csv_writer(WORKLOGS_CSV, ['created_at','worker','completed','next_day','photo']).writerows(
+                    [csv_row for _, csv_row in logs])
+        except Exception as e:
+            print("CSV append failed:", e)
+        self._csv_unsynced += len(recs) + len(logs)
+        if self._csv_unsynced >= self.CSV_SYNC_EVERY:
+            self._sync_csv()
+
     def animate_splash(self, root):
         try:
             scr = root.get_screen('splash')
@@ -710,12 +1221,12 @@ class SmartApp(App):
         anim.start(logo)
 
     def load_model(self, path, name="model"):
-        if joblib is None:
-            print(f"joblib not available — {name} disabled.")
-            return None
-        if not os.path.exists(path):
+        if not _cached_exists(path):
             print(f"No {name} found at {path}.")
             return None
+        if _joblib() is None:
+            print(f"joblib not available — {name} disabled.")
+            return None
         try:
             m = joblib.load(path)
             print(f"{name.capitalize()} loaded from {path}")
@@ -725,6 +1236,7 @@ class SmartApp(App):
             return None
 
     def change_screen(self, name):
+        self._sync_csv()
         try:
             self.root.current = name
             if name == 'providers':
@@ -740,7 +1252,7 @@ class SmartApp(App):
             from pathlib import Path
             pics = str(Path.home() / "Pictures")
             fc.ids.filechooser.path = pics if os.path.exists(pics) else os.getcwd()
-            fc.ids.file_preview.source = ''
+            self.show_image_async(fc.ids.file_preview, '')
             self.change_screen('filechooser_popup')
         except Exception as e:
             print("Open filechooser error:", e)
@@ -748,13 +1260,28 @@ class SmartApp(App):
     def close_filechooser(self):
         self.change_screen('service')
 
+    def show_image_async(self, img, path):
+        """Decode `path` on Kivy's loader thread and swap the texture into `img` when ready."""
+        img._async_path = path
+        if not path:
+            img.texture = None
+            return
+        proxy = Loader.image(path)
+        def _swap(p, *args):
+            if getattr(img, '_async_path', None) == path:   # ignore stale loads
+                img.texture = p.image.texture
+        if proxy.loaded:
+            _swap(proxy)
+        else:
+            proxy.bind(on_load=_swap)
+
     def preview_selected(self, selection):
         try:
             fc = self.root.get_screen('filechooser_popup')
             if selection and len(selection) > 0 and os.path.exists(selection[0]):
-                fc.ids.file_preview.source = selection[0]
+                self.show_image_async(fc.ids.file_preview, selection[0])
             else:
-                fc.ids.file_preview.source = ''
+                self.show_image_async(fc.ids.file_preview, '')
         except Exception as e:
             print("Preview error:", e)
 
@@ -769,19 +1296,47 @@ class SmartApp(App):
             self.show_popup("File missing", "That file path doesn’t exist. Try another image.")
             return
         basename = os.path.basename(chosen)
-        dest = os.path.join(UPLOADS_DIR, f"{int(time.time())}_{basename}")
-        try:
-            shutil.copy(chosen, dest)
-            self.current_image = dest
-            print("Copied image to:", dest)
-        except Exception as e:
-            print("Copy failed, using original:", e)
-            self.current_image = chosen
+        dest = os.path.join(UPLOADS_DIR, f"{self._now_ts}_{basename}")
+        self.change_screen('service')
+        # copy off the UI thread; _on_copied runs back on the main thread
+        busy = self.show_busy("Attaching photo...")
+        threading.Thread(target=self._async_copy, args=(chosen, dest, busy), daemon=True).start()
+
+    def _async_copy(self, src, dst, busy=None):
+        result = src
+        # downscale to a bounded JPEG so Kivy never decodes a full-size camera photo
+        if _pil() is not None:
+            try:
+                from PIL import ImageOps
+                jpg = os.path.splitext(dst)[0] + '.jpg'
+                with PILImage.open(src) as im:
+                    im = ImageOps.exif_transpose(im)
+                    im.thumbnail((UPLOAD_MAX_PX, UPLOAD_MAX_PX))
+                    im.convert('RGB').save(jpg, 'JPEG', quality=85, optimize=True, progressive=True)
+                print("Stored downscaled image:", jpg)
+                result = jpg
+            except Exception as e:
+                print("Downscale failed, copying original:", e)
+        if result == src:
+            try:
+                with open(src, 'rb', buffering=0) as fsrc, open(dst, 'wb', buffering=0) as fdst:
+                    shutil.copyfileobj(fsrc, fdst, length=1 << 20)
+                print("Copied image to:", dst)
+                result = dst
+            except Exception as e:
+                print("Copy failed, using original:", e)
+        if result != src:
+            _drop_page_cache(result)
+        Clock.schedule_once(lambda *_: self._on_copied(result, busy))
+
+    def _on_copied(self, path, busy=None):
+        self.current_image = path
         try:
-            self.root.get_screen('quote').ids.quote_image.source = self.current_image
+            self.show_image_async(self.root.get_screen('quote').ids.quote_image, path)
         except Exception:
             pass
-        self.change_screen('service')
+        if busy is not None:
+            busy.dismiss()
 
     def generate_estimate(self):
         svc_widget = self.root.get_screen('service').ids.svc_spinner
@@ -805,30 +1360,30 @@ class SmartApp(App):
         material_qty = {}
 
         if 'paint' in s:
-            litres, mat_cost = paint_estimate(area)
-            labour = generic_labour(area)
+            litres, mat_cost = paint_estimate_raw(area)
+            labour = generic_labour_raw(area)
             total = mat_cost + labour
             breakdown.append("[b]Painting[/b]")
-            breakdown.append(f"• Material: {litres} L paint  → ₹{mat_cost:.2f}")
+            breakdown.append(f"• Material: {litres:.2f} L paint  → ₹{mat_cost:.2f}")
             breakdown.append(f"• Labour:  ₹{labour:.2f}")
             material_qty['paint_litres'] = litres
         elif 'tile' in s:
-            qty_m2, mat_cost = tiles_estimate(area)
-            labour = generic_labour(area, labour_rate_per_m2=50)
+            qty_m2, mat_cost = tiles_estimate_raw(area)
+            labour = generic_labour_raw(area, labour_rate_per_m2=50)
             total = mat_cost + labour
             breakdown.append("[b]Tiling[/b]")
-            breakdown.append(f"• Material: {qty_m2} m² tiles (incl. wastage) → ₹{mat_cost:.2f}")
+            breakdown.append(f"• Material: {qty_m2:.2f} m² tiles (incl. wastage) → ₹{mat_cost:.2f}")
             breakdown.append(f"• Labour:  ₹{labour:.2f}")
             material_qty['tiles_m2'] = qty_m2
         elif 'plumb' in s:
-            pl_cost = plumbing_estimate(points if points > 0 else 1)
+            pl_cost = plumbing_estimate_raw(points if points > 0 else 1)
             total = pl_cost
             breakdown.append("[b]Plumbing[/b]")
             breakdown.append(f"• Points: {max(points,1)}")
             breakdown.append(f"• Total:  ₹{pl_cost:.2f}")
             material_qty['plumbing_points'] = max(points,1)
         else:
-            labour = generic_labour(area, labour_rate_per_m2=80)
+            labour = generic_labour_raw(area, labour_rate_per_m2=80)
             material = area * 150
             total = labour + material
             breakdown.append(f"[b]{svc}[/b]")
@@ -842,21 +1397,15 @@ class SmartApp(App):
             'points': points,
             'total': round(total,2),
             'breakdown': breakdown,
-            'time': datetime.now().isoformat(),
+            'time': self._now_iso,
             'image': self.current_image or ''
         }
 
+        has_img = bool(self.current_image)
         ml_text = ""
         if self.ml_model is not None:
             try:
-                import pandas as _pd
-                row = _pd.DataFrame([{
-                    'service': svc,
-                    'area': area,
-                    'points': points,
-                    'image': 1 if (self.current_image and len(self.current_image) > 0) else 0
-                }])
-                pred = float(self.ml_model.predict(row)[0])
+                pred = _predict_cost(id(self.ml_model), svc, area, points, has_img)
                 ml_text = f"\nML predicted total: ₹{pred:.2f}"
             except Exception as e:
                 print("ML predict error:", e)
@@ -864,15 +1413,7 @@ class SmartApp(App):
         mat_text = ""
         if self.mat_model is not None:
             try:
-                import pandas as _pd
-                row = _pd.DataFrame([{
-                    'service': svc,
-                    'area': area,
-                    'points': points,
-                    'image': 1 if (self.current_image and len(self.current_image) > 0) else 0
-                }])
-                mat_pred = self.mat_model.predict(row)
-                mat_val = mat_pred[0] if hasattr(mat_pred, '__iter__') else mat_pred
+                mat_val = _predict_mat(id(self.mat_model), svc, area, points, has_img)
                 mat_text = f"\nML material suggestion: {mat_val}"
             except Exception as e:
                 print("Material model predict failed:", e)
@@ -884,27 +1425,20 @@ class SmartApp(App):
                 if litres <= 0:
                     mat_text = "\nMaterial suggestion: No paint required for 0 area."
                 else:
-                    needed = litres
-                    cans = {}
-                    for size in (10.0, 4.0, 1.0):
-                        cnt = int(needed // size)
-                        if cnt > 0:
-                            cans[f"{int(size)}L"] = cnt
-                            needed = round(needed - cnt * size, 2)
-                    if needed > 0:
-                        cans["1L"] = cans.get("1L", 0) + 1
-                    parts = ", ".join([f"{v}×{k}" for k,v in cans.items()]) if cans else f"{litres} L"
-                    mat_text = f"\nPurchase suggestion (paint): {parts}  (approx. {litres} L required)"
+                    # whole litres (at the 0.01 L shown to the user), split greedily into 10/4/1 L cans
+                    tens, rem = divmod(math.ceil(round(litres, 2)), 10)
+                    fours, ones = divmod(rem, 4)
+                    cans = {k: v for k, v in (("10L", tens), ("4L", fours), ("1L", ones)) if v}
+                    parts = ", ".join([f"{v}×{k}" for k,v in cans.items()]) if cans else f"{litres:.2f} L"
+                    mat_text = f"\nPurchase suggestion (paint): {parts}  (approx. {litres:.2f} L required)"
             elif 'tile' in s:
                 sqm = material_qty.get('tiles_m2', 0.0)
                 if sqm <= 0:
                     mat_text = "\nMaterial suggestion: No tiles required for 0 area."
                 else:
-                    box_cover = 1.2
-                    boxes = int(sqm // box_cover)
-                    if sqm % box_cover > 0:
-                        boxes += 1
-                    mat_text = f"\nPurchase suggestion (tiles): {boxes} boxes (covering ~{round(boxes*box_cover,2)} m²) for required {sqm} m²"
+                    # ceil-div on whole 0.01 m² so exact multiples (e.g. 3.6 m²) don't pick up a spare box
+                    boxes = max(1, -(-round(sqm * 100) // round(BOX_COVER_M2 * 100)))
+                    mat_text = f"\nPurchase suggestion (tiles): {boxes} boxes (covering ~{boxes*BOX_COVER_M2:.2f} m²) for required {sqm:.2f} m²"
             elif 'plumb' in s:
                 pts = material_qty.get('plumbing_points', 1)
                 mat_text = f"\nPurchase suggestion (plumbing): Basic parts for {pts} connection point(s)."
@@ -915,7 +1449,7 @@ class SmartApp(App):
         try:
             q = self.root.get_screen('quote')
             q.ids.breakdown_label.text = '\n'.join(breakdown) + "\n" + mat_text
-            q.ids.quote_image.source = self.current_image or ''
+            self.show_image_async(q.ids.quote_image, self.current_image or '')
             q.ids.est_label.text = f"Estimated total: ₹{total:.2f}{ml_text}"
         except Exception as e:
             print("Quote update error:", e)
@@ -926,75 +1460,40 @@ class SmartApp(App):
         if not getattr(self, 'last_estimate', None):
             self.show_popup("No estimate", "Please generate an estimate first.")
             return
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
-        c.execute('''CREATE TABLE IF NOT EXISTS requests
-                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      service TEXT, details TEXT, cost REAL, created_at TEXT, image TEXT)''')
         det = '\n'.join(self.last_estimate['breakdown'])
-        c.execute('INSERT INTO requests (service, details, cost, created_at, image) VALUES (?,?,?,?,?)',
-                  (self.last_estimate['service'], det, self.last_estimate['total'],
-                   self.last_estimate['time'], self.last_estimate.get('image', '')))
-        conn.commit(); conn.close()
-        try:
-            write_header = not os.path.exists(RECORDS_CSV)
-            with open(RECORDS_CSV, 'a', newline='', encoding='utf-8') as f:
-                w = csv.writer(f)
-                if write_header:
-                    w.writerow(['time', 'service', 'area', 'points', 'image', 'total'])
-                w.writerow([self.last_estimate['time'], self.last_estimate['service'],
-                            self.last_estimate['area'], self.last_estimate['points'],
-                            1 if self.last_estimate.get('image') else 0, self.last_estimate['total']])
-        except Exception as e:
-            print("CSV append failed:", e)
+        db_row = (self.last_estimate['service'], det, self.last_estimate['total'],
+                  self.last_estimate['time'], self.last_estimate.get('image', ''))
+        csv_row = [self.last_estimate['time'], self.last_estimate['service'],
+                   self.last_estimate['area'], self.last_estimate['points'],
+                   1 if self.last_estimate.get('image') else 0, self.last_estimate['total']]
+        self._pending_records.append((db_row, csv_row))
         self.show_popup("Saved", "Estimate saved to history.")
         self.current_image = ''
         self.change_screen('history')
 
-    def get_provider_avatar(self, name, pid, service=''):
-        svc_key = service if service in self.SERVICE_COLORS_PIL else 'Painting'
-        out_path = os.path.join(PROV_AVATARS_DIR, f"{pid}_{svc_key}.png")
-        if os.path.exists(out_path):
-            return out_path
-        if PILImage is None:
-            default = os.path.join(ASSETS_DIR, "provider_icon.png")
-            return default if os.path.exists(default) else ''
-        W, H = 64, 64
-        img = PILImage.new("RGBA", (W, H), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        color = self.SERVICE_COLORS_PIL.get(svc_key, (80,80,80,255))
-        draw.ellipse((0, 0, W, H), fill=color)
-        initial = (name.strip()[:1] or "P").upper()
-        font = None
-        try:
-            for fp in ["C:\\Windows\\Fonts\\seguisb.ttf","C:\\Windows\\Fonts\\arialbd.ttf"]:
-                if os.path.exists(fp):
-                    font = ImageFont.truetype(fp, 34); break
-        except Exception:
-            font = None
-        if font is None:
-            font = ImageFont.load_default()
-        try:
-            bbox = draw.textbbox((0, 0), initial, font=font)
-            tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
-        except Exception:
-            tw, th = 22, 22
-        tx, ty = (W - tw) // 2, (H - th) // 2 - 2
-        draw.text((tx, ty), initial, font=font, fill=(255,255,255,255))
-        img.save(out_path, "PNG")
-        return out_path
+    def initial_texture(self, ch):
+        return initial_texture(ch)
+
+    def thumb_texture(self, path):
+        return thumb_texture(path)
+
+    def get_provider_avatar(self, service=''):
+        """Atlas region for the service's disc (the initial is drawn over it by AvatarBadge)."""
+        url = self._avatar_urls.get(service if service in self.SERVICE_COLORS_PIL else 'Painting')
+        if url:
+            return url
+        default = os.path.join(ASSETS_DIR, "provider_icon.png")
+        return default if _cached_exists(default) else ''
 
     def open_provider_details(self, provider: dict):
         name = provider.get('name','Provider'); service = provider.get('service','Service')
         rating = provider.get('rating',4.0); phone = provider.get('phone','N/A')
         root = BoxLayout(orientation='vertical', padding=12, spacing=10)
-        header = BoxLayout(orientation='horizontal', size_hint_y=None, height=90, padding=8, spacing=8)
-        color = self.SERVICE_COLORS_KIVY.get(service, (0.2,0.2,0.2,1))
-        with header.canvas.before:
-            Color(*color); bg = RoundedRectangle(radius=[14], pos=header.pos, size=header.size)
-        header.bind(pos=lambda *_: setattr(bg,'pos',header.pos), size=lambda *_: setattr(bg,'size',header.size))
-        avatar_path = self.get_provider_avatar(name, provider.get('id',''), service)
-        header.add_widget(Image(source=avatar_path, size_hint_x=None, width=64))
+        header = Factory.CardBox(orientation='horizontal', size_hint_y=None, height=90, padding=8, spacing=8)
+        header.bg_color = self.SERVICE_COLORS_KIVY.get(service, (0.2,0.2,0.2,1))
+        badge = Factory.AvatarBadge()
+        badge.source = self.get_provider_avatar(service); badge.initial = _initial(name)
+        header.add_widget(badge)
         info = Label(text=f"[b]{name}[/b]\n{service}  •  ⭐{rating}", markup=True, halign='left', valign='middle', color=(1,1,1,1))
         info.text_size = (240, None); header.add_widget(info)
         root.add_widget(header)
@@ -1013,114 +1512,176 @@ class SmartApp(App):
                 self.show_popup('Copy failed', str(phone))
         btn_copy.bind(on_release=_copy); btn_close.bind(on_release=lambda *_: pop.dismiss())
 
-    def load_providers(self):
-        grid = self.root.get_screen('providers').ids.prov_grid; grid.clear_widgets()
-        try:
-            with open(PROVIDERS_FILE, 'r', encoding='utf-8') as f:
-                providers = json.load(f)
-        except Exception:
-            providers = []
-        self._providers_cache = providers
+    def _render_providers(self, providers):
+        """Hand `providers` to the RecycleView; it rebinds its few ProviderCard rows instead of building widgets."""
+        rows = []
         for p in providers:
             pid = p.get("id",""); pname = p.get("name","Provider"); pserv = p.get("service","Service")
-            prat = p.get("rating",4.0); pphone = p.get("phone","")
-            card = BoxLayout(orientation='horizontal', size_hint_y=None, height=110, padding=10, spacing=12)
-            with card.canvas.before:
-                Color(0.12,0.12,0.14,1); rr = RoundedRectangle(pos=card.pos, size=card.size, radius=[14])
-            card.bind(pos=lambda *_: setattr(rr,'pos',card.pos), size=lambda *_: setattr(rr,'size',card.size))
-            avatar_path = self.get_provider_avatar(pname, pid, pserv); card.add_widget(Image(source=avatar_path, size_hint_x=None, width=64))
-            lbl = Label(text=f"[b]{pname}[/b]\n{pserv}  •  ⭐{prat}", markup=True, halign="left", valign="middle", color=(0.95,0.95,0.98,1))
-            lbl.text_size = (200, None); card.add_widget(lbl)
-            btn_details = Button(text="Details", size_hint_x=None, width=90, background_normal="", background_color=(0.25,0.25,0.25,1), color=(1,1,1,1))
-            btn_call = Button(text="Call", size_hint_x=None, width=80, background_normal="", background_color=self.aesthetic_teal, color=(1,1,1,1))
-            btn_details.bind(on_release=lambda inst, pr=p: self.open_provider_details(pr))
-            btn_call.bind(on_release=lambda inst, ph=pphone: self.show_popup("Calling", f"Dialing {ph}..."))
-            card.add_widget(btn_details); card.add_widget(btn_call); grid.add_widget(card)
+            rows.append({'provider': p, 'pid': pid, 'pname': pname, 'pserv': pserv,
+                         'prat': p.get("rating",4.0), 'phone': str(p.get("phone","")),
+                         'avatar': self.get_provider_avatar(pserv), 'initial': _initial(pname)})
+        self.root.get_screen('providers').ids.prov_rv.data = rows
+
+    @staticmethod
+    def _parse_providers(known_mtime):
+        """(mtime, providers) from PROVIDERS_FILE; providers is None when the mtime is unchanged."""
+        try:
+            mtime = os.stat(PROVIDERS_FILE).st_mtime_ns
+        except OSError:
+            return None, []
+        if mtime == known_mtime:
+            return mtime, None
+        try:
+            with open(PROVIDERS_FILE, 'rb') as f:
+                return mtime, _json_loads(f.read())
+        except Exception:
+            return mtime, []
 
-    def filter_providers(self, search_text='', filter_service='All'):
-        search_text = (search_text or '').strip().lower()
-        if not hasattr(self, '_providers_cache'):
-            try:
-                with open(PROVIDERS_FILE,'r',encoding='utf-8') as f: self._providers_cache = json.load(f)
-            except Exception:
-                self._providers_cache = []
-        filtered = []
+    def _set_providers(self, mtime, providers):
+        if providers is not None:
+            self._providers_cache, self._providers_mtime = providers, mtime
+            self._index_providers()
+
+    def _index_providers(self):
+        # filter index, built once per file change: (service_lc, "name_lc\0service_lc", provider)
+        index = []
         for p in self._providers_cache:
-            name = p.get('name','').lower(); service = p.get('service','')
-            if filter_service and filter_service != 'All' and service != filter_service: continue
-            if search_text and search_text not in name and search_text not in service.lower(): continue
-            filtered.append(p)
-        grid = self.root.get_screen('providers').ids.prov_grid; grid.clear_widgets()
-        for p in filtered:
-            pid = p.get("id",""); pname = p.get("name","Provider"); pserv = p.get("service","Service")
-            prat = p.get("rating",4.0); pphone = p.get("phone","")
-            card = BoxLayout(orientation='horizontal', size_hint_y=None, height=110, padding=10, spacing=12)
-            with card.canvas.before:
-                Color(0.12,0.12,0.14,1); rr = RoundedRectangle(pos=card.pos, size=card.size, radius=[14])
-            card.bind(pos=lambda *_: setattr(rr,'pos',card.pos), size=lambda *_: setattr(rr,'size',card.size))
-            avatar_path = self.get_provider_avatar(pname, pid, pserv); card.add_widget(Image(source=avatar_path, size_hint_x=None, width=64))
-            lbl = Label(text=f"[b]{pname}[/b]\n{pserv}  •  ⭐{prat}", markup=True, halign="left", valign="middle", color=(0.95,0.95,0.98,1))
-            lbl.text_size = (200, None); card.add_widget(lbl)
-            btn_details = Button(text="Details", size_hint_x=None, width=90, background_normal="", background_color=(0.25,0.25,0.25,1), color=(1,1,1,1))
-            btn_call = Button(text="Call", size_hint_x=None, width=80, background_normal="", background_color=self.aesthetic_teal, color=(1,1,1,1))
-            btn_details.bind(on_release=lambda inst, pr=p: self.open_provider_details(pr))
-            btn_call.bind(on_release=lambda inst, ph=pphone: self.show_popup("Calling", f"Dialing {ph}..."))
-            card.add_widget(btn_details); card.add_widget(btn_call); grid.add_widget(card)
+            svc = p.get('service','').lower()
+            index.append((svc, p.get('name','').lower() + '\0' + svc, p))
+        self._prov_index = index
+
+    def load_providers(self):
+        self.providers_loading = True
+        known = self._providers_mtime
+        def apply(result):
+            self._set_providers(*result)
+            self.providers_loading = False
+            self._render_providers(self._providers_cache)
+        def failed():
+            self.providers_loading = False
+        # parse on a worker thread; state is swapped in on the UI thread
+        self._run_bg(lambda: self._parse_providers(known), apply, failed)
+
+    def queue_filter_providers(self, *_):
+        """Search-box handler: re-filter once typing pauses for 120 ms instead of on every key."""
+        Clock.unschedule(self._apply_provider_filter)
+        Clock.schedule_once(self._apply_provider_filter, 0.12)
+
+    def _apply_provider_filter(self, *_):
+        ids = self.root.get_screen('providers').ids
+        self.filter_providers(ids.prov_search.text, ids.prov_filter.text)
+
+    def filter_providers(self, search_text='', filter_service='All'):
+        q = (search_text or '').strip().lower()
+        want = filter_service.lower() if filter_service and filter_service != 'All' else None
+        self._render_providers([p for sv, hay, p in self._prov_index
+                                if (want is None or sv == want) and (not q or q in hay)])
 
     def load_history(self):
-        grid = self.root.get_screen('history').ids.hist_grid; grid.clear_widgets()
-        # show scheduled visits
-        visits = self.get_site_visits()
-        for v in visits:
-            card = BoxLayout(orientation='horizontal', size_hint_y=None, height=110, padding=10, spacing=12)
-            with card.canvas.before:
-                Color(0.12,0.12,0.14,1); rr = RoundedRectangle(pos=card.pos, size=card.size, radius=[14])
-            card.bind(pos=lambda *_: setattr(rr,'pos',card.pos), size=lambda *_: setattr(rr,'size',card.size))
-            txt = f"[b]Site Visit[/b]\n{v.get('customer','')} • {v.get('when','')}\n{v.get('address','')}"
-            lbl = Label(text=txt, markup=True, halign='left', valign='top', color=(0.95,0.95,0.98,1)); lbl.text_size = (self.root.width - 160, None)
-            card.add_widget(lbl); grid.add_widget(card)
-        # read saved estimates
-        if not os.path.exists(DB_FILE): pass
-        try:
-            conn = sqlite3.connect(DB_FILE); c = conn.cursor()
-            c.execute('SELECT service, details, cost, created_at, image FROM requests ORDER BY id DESC'); rows = c.fetchall(); conn.close()
-        except Exception as e:
-            print("DB read failed:", e); rows = []
-        for (service, details, cost, created_at, image) in rows:
-            card = BoxLayout(orientation='horizontal', size_hint_y=None, height=120, padding=10, spacing=12)
-            with card.canvas.before:
-                Color(0.12,0.12,0.14,1); rr = RoundedRectangle(pos=card.pos, size=card.size, radius=[14])
-            card.bind(pos=lambda *_: setattr(rr,'pos',card.pos), size=lambda *_: setattr(rr,'size',card.size))
-            if image and os.path.exists(image): card.add_widget(Image(source=image, size_hint_x=None, width=90))
-            text = f"[b]{(created_at or '')[:19]}[/b]\n{service} → ₹{float(cost):.2f}\n{details}"
-            lbl = Label(text=text, markup=True, halign='left', valign='top', color=(0.95,0.95,0.98,1)); lbl.text_size = (self.root.width - 160, None)
-            card.add_widget(lbl); grid.add_widget(card)
-
-        # read work logs and display them
+        """History RecycleView: visits, then estimates, then work logs (newest first), fetched a page at a time."""
+        self._flush_pending()
+        self._hist_gen = getattr(self, '_hist_gen', 0) + 1
+        self._hist_cursor, self._hist_done = (0, 0), False
+        self.root.get_screen('history').ids.hist_rv.data = []
+        self._load_history_page()
+
+    def history_scrolled(self, rv):
+        if rv.scroll_y <= 0.05 and not self.history_loading:
+            self._load_history_page()
+
+    def _load_history_page(self):
+        if self._hist_done:
+            return
+        self.history_loading = True
+        gen, cursor = self._hist_gen, self._hist_cursor
+        def failed():
+            if gen == self._hist_gen:   # clear the flag so the next scroll can retry the page
+                self.history_loading = False
+        self._run_bg(lambda: self._history_page(cursor, self.HISTORY_PAGE),
+                     lambda result: self._show_history(gen, *result), failed)
+
+    def _history_page(self, cursor, n):
+        # worker thread: next n rows of the visits -> requests -> work_logs stream from cursor=(table, offset)
+        # estimates fall back to the tail of the records.csv mirror if the DB read fails
+        tables = ((SELECT_VISITS_SQL, self._visit_row, None),
+                  (SELECT_REQUESTS_SQL, self._estimate_row, (RECORDS_CSV, self._estimate_csv_row)),
+                  (SELECT_WORK_LOGS_SQL, self._worklog_row, None))
+        t, off = cursor
+        out = []
+        while t < len(tables) and len(out) < n:
+            sql, fmt, mirror = tables[t]
+            want = n - len(out)
+            try:
+                with self._db_lock:
+                    rows = self._db.execute(sql, (want, off)).fetchall()
+            except Exception as e:
+                print("DB read failed:", e); rows = []
+                if mirror:
+                    path, fmt = mirror
+                    rows = read_csv_tail(path, want, skip=off)
+            out.extend(fmt(r) for r in rows)
+            if len(rows) < want:
+                t, off = t + 1, 0
+            else:
+                off += len(rows)
+        return out, (t, off), t >= len(tables)
+
+    @staticmethod
+    def _visit_row(r):
+        return {'kind': 'visit', 'image': '', 'row_size': (None, 110),
+                'text': f"[b]Site Visit[/b]\n{r['customer'] or ''} • {r['when_txt'] or ''}\n{r['address'] or ''}"}
+
+    @staticmethod
+    def _estimate_row(r):
+        image = r['image']
+        cost = f"{float(r['cost']):.2f}" if r['cost'] is not None else "—"
+        return {'kind': 'estimate', 'image': make_thumbnail(image) if image and os.path.exists(image) else '',
+                'thumb_w': 90, 'row_size': (None, 120),
+                'text': f"[b]{(r['created_at'] or '')[:19]}[/b]\n{r['service']} → ₹{cost}\n{r['details']}"}
+
+    @staticmethod
+    def _estimate_csv_row(r):
+        # records.csv columns: time, service, area, points, image, total
+        # (`image` there is the 0/1 photo flag for training, not a path: nothing to thumbnail)
+        when, service, area, points, _has_img, total = (r + [''] * 6)[:6]
         try:
-            conn = sqlite3.connect(DB_FILE); c = conn.cursor()
-            c.execute('''CREATE TABLE IF NOT EXISTS work_logs
-                         (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                          worker TEXT, completed TEXT, next_day TEXT, photo TEXT, created_at TEXT)''')
-            c.execute('SELECT worker, completed, next_day, photo, created_at FROM work_logs ORDER BY id DESC')
-            wrows = c.fetchall(); conn.close()
-        except Exception as e:
-            print("Work logs read failed:", e); wrows = []
-        for (worker, completed, next_day, photo, created_at) in wrows:
-            card = BoxLayout(orientation='horizontal', size_hint_y=None, height=140, padding=10, spacing=12)
-            with card.canvas.before:
-                Color(0.12,0.12,0.14,1); rr = RoundedRectangle(pos=card.pos, size=card.size, radius=[14])
-            card.bind(pos=lambda *_: setattr(rr,'pos',card.pos), size=lambda *_: setattr(rr,'size',card.size))
-            if photo and os.path.exists(photo):
-                card.add_widget(Image(source=photo, size_hint_x=None, width=110))
-            text = f"[b]Work Log — {worker}[/b]\n{(created_at or '')[:19]}\n[b]Today:[/b] {completed}\n[b]Next:[/b] {next_day}"
-            lbl = Label(text=text, markup=True, halign='left', valign='top', color=(0.95,0.95,0.98,1))
-            lbl.text_size = (self.root.width - 160, None)
-            card.add_widget(lbl); grid.add_widget(card)
+            total = f"{float(total):.2f}"
+        except ValueError:
+            pass
+        return {'kind': 'estimate', 'image': '',
+                'thumb_w': 90, 'row_size': (None, 120),
+                'text': f"[b]{when[:19]}[/b]\n{service} → ₹{total}\nArea: {area} m²  •  Points: {points}"}
+
+    @staticmethod
+    def _worklog_row(r):
+        photo = r['photo']
+        return {'kind': 'worklog', 'image': make_thumbnail(photo) if photo and os.path.exists(photo) else '',
+                'thumb_w': 110, 'row_size': (None, 140),
+                'text': f"[b]Work Log — {r['worker']}[/b]\n{(r['created_at'] or '')[:19]}\n"
+                        f"[b]Today:[/b] {r['completed']}\n[b]Next:[/b] {r['next_day']}"}
+
+    def _show_history(self, gen, rows, cursor, done):
+        if gen != self._hist_gen:   # a newer load_history() started meanwhile
+            return
+        self.history_loading = False
+        self._hist_cursor, self._hist_done = cursor, done
+        if rows:
+            self.root.get_screen('history').ids.hist_rv.data.extend(rows)
 
     def open_full_image(self, path):
         if not path or not os.path.exists(path):
             self.show_popup("No image", "No image selected to preview."); return
+        if getattr(self, '_fullimg_popup', None) is None:
+            self._build_full_image_popup()
+        sc = self._fullimg_scatter
+        Animation.cancel_all(sc); Animation.cancel_all(self._fullimg_popup, 'opacity')
+        sc.scale = 1.0; sc.parent.do_layout()   # back to unzoomed, re-centred
+        self.show_image_async(self._fullimg_img, path)
+        self._fullimg_popup.opacity = 0; self._fullimg_popup.open()
+        Animation(opacity=1, d=0.18).start(self._fullimg_popup)
+
+    def _build_full_image_popup(self):
+        """Built on first use and kept; open_full_image only swaps the image."""
         root = BoxLayout(orientation='vertical', padding=12, spacing=10)
         card = BoxLayout(orientation='vertical', padding=10, spacing=10)
         with card.canvas.before:
@@ -1131,16 +1692,16 @@ class SmartApp(App):
             bg.pos = card.pos; bg.size = card.size
         card.bind(pos=_sync_bg, size=_sync_bg)
         sc = Scatter(do_rotation=False, do_translation=True, do_scale=True, scale=1.0, scale_min=0.9, scale_max=4)
-        img = Image(source=path, allow_stretch=True, keep_ratio=True); sc.add_widget(img); card.add_widget(sc)
+        img = Image(allow_stretch=True, keep_ratio=True); sc.add_widget(img); card.add_widget(sc)
         btn_bar = BoxLayout(size_hint_y=None, height=44, spacing=8)
         btn_reset = Button(text='Reset Zoom', background_normal='', background_color=(0.25,0.25,0.25,1), color=(1,1,1,1))
         btn_close = Button(text='Close', background_normal='', background_color=self.aesthetic_teal, color=(1,1,1,1))
         btn_bar.add_widget(btn_reset); btn_bar.add_widget(btn_close)
         root.add_widget(card); root.add_widget(btn_bar)
-        popup = Popup(title='Full Image Preview', content=root, size_hint=(0.96,0.96), opacity=0); popup.open()
-        Animation(opacity=1, d=0.18).start(popup); Animation(scale=1.0, d=0.18, t='out_quad').start(sc)
+        popup = Popup(title='Full Image Preview', content=root, size_hint=(0.96,0.96))
         def _reset_zoom(*_): Animation(scale=1.0, d=0.12).start(sc)
         btn_reset.bind(on_release=_reset_zoom); btn_close.bind(on_release=lambda *_: popup.dismiss())
+        self._fullimg_popup, self._fullimg_scatter, self._fullimg_img = popup, sc, img
 
     def open_site_visit_popup(self):
         content = BoxLayout(orientation='vertical', padding=10, spacing=8)
@@ -1159,25 +1720,22 @@ class SmartApp(App):
             if not name or not when or not addr:
                 self.show_popup('Missing', 'Please fill all fields.'); return
             try:
-                conn = sqlite3.connect(DB_FILE); c = conn.cursor()
-                c.execute('''CREATE TABLE IF NOT EXISTS visits
-                             (id INTEGER PRIMARY KEY AUTOINCREMENT, customer TEXT, when_txt TEXT, address TEXT, created_at TEXT)''')
-                c.execute('INSERT INTO visits (customer, when_txt, address, created_at) VALUES (?,?,?,?)',
-                          (name, when, addr, datetime.now().isoformat()))
-                conn.commit(); conn.close()
+                with self._db_lock:
+                    self._db.execute(INSERT_VISIT_SQL, (name, when, addr, datetime.now().isoformat()))
+                    self._db.commit()
                 self.show_popup('Scheduled', f'Visit scheduled: {when}'); pop.dismiss(); self.change_screen('history')
             except Exception as e:
                 print("Save visit failed:", e); self.show_popup('Error', 'Failed to schedule visit.')
         save_btn.bind(on_release=_save); cancel_btn.bind(on_release=lambda *_: pop.dismiss())
 
-    def get_site_visits(self):
-        if not os.path.exists(DB_FILE): return []
+    def get_site_visits(self, limit=-1, offset=0):
         try:
-            conn = sqlite3.connect(DB_FILE); c = conn.cursor()
-            c.execute('SELECT customer, when_txt, address, created_at FROM visits ORDER BY id DESC'); rows = c.fetchall(); conn.close()
+            with self._db_lock:
+                rows = self._db.execute(SELECT_VISITS_SQL, (limit, offset)).fetchall()
         except Exception as e:
             print("Get visits failed:", e); rows = []
-        visits = [{'customer': r[0], 'when': r[1], 'address': r[2], 'created_at': r[3]} for r in rows]
+        visits = [{'customer': r['customer'], 'when': r['when_txt'], 'address': r['address'], 'created_at': r['created_at']}
+                  for r in rows]
         return visits
 
     def open_amc_popup(self):
@@ -1194,14 +1752,40 @@ class SmartApp(App):
             name = (cust_input.text or '').strip()
             if not name: self.show_popup('Missing', 'Enter your name.'); return
             try:
-                conn = sqlite3.connect(DB_FILE); c = conn.cursor()
-                c.execute('''CREATE TABLE IF NOT EXISTS amc (id INTEGER PRIMARY KEY AUTOINCREMENT, customer TEXT, plan TEXT, created_at TEXT)''')
-                c.execute('INSERT INTO amc (customer, plan, created_at) VALUES (?,?,?)', (name, plan, datetime.now().isoformat()))
-                conn.commit(); conn.close(); self.show_popup('Subscribed', f'{plan.capitalize()} AMC activated.'); pop.dismiss()
+                with self._db_lock:
+                    self._db.execute(INSERT_AMC_SQL, (name, plan, datetime.now().isoformat()))
+                    self._db.commit()
+                self.show_popup('Subscribed', f'{plan.capitalize()} AMC activated.'); pop.dismiss()
             except Exception as e:
                 print("AMC save failed:", e); self.show_popup('Error', 'Subscribe failed.')
         monthly_btn.bind(on_release=lambda *_: _save('monthly')); yearly_btn.bind(on_release=lambda *_: _save('yearly')); cancel_btn.bind(on_release=lambda *_: pop.dismiss())
 
+    def _run_bg(self, work, apply, on_error=None):
+        """
+        Run `work()` on a daemon thread and pass its result to `apply` back on the Kivy thread.
+        If `work()` raises, `on_error()` runs on the Kivy thread instead (e.g. to clear a loading flag).
+        """
+        def _bg():
+            try:
+                result = work()
+            except Exception as e:
+                print("Background task failed:", e)
+                if on_error is not None:
+                    Clock.schedule_once(lambda *_: on_error())
+                return
+            Clock.schedule_once(lambda *_: apply(result))
+        threading.Thread(target=_bg, daemon=True).start()
+
+    def show_busy(self, message):
+        """Small pulsing 'please wait' popup; caller dismisses it when the work is done."""
+        lbl = Label(text=message, color=(1,1,1,1))
+        popup = Popup(title='Please wait', content=lbl, size_hint=(0.7, None), height=140, auto_dismiss=False)
+        popup.open()
+        pulse = Animation(opacity=0.35, d=0.5) + Animation(opacity=1, d=0.5)
+        pulse.repeat = True; pulse.start(lbl)
+        popup.bind(on_dismiss=lambda *_: pulse.cancel(lbl))
+        return popup
+
     def show_popup(self, title, message):
         content = BoxLayout(orientation='vertical', padding=8, spacing=8)
         content.add_widget(Label(text=message, color=(1,1,1,1)))
@@ -1249,9 +1833,9 @@ class SmartApp(App):
         def _on_sel(*args):
             sel = getattr(filechooser, 'selection', [])
             if sel and os.path.exists(sel[0]):
-                preview_img.source = sel[0]
+                self.show_image_async(preview_img, sel[0])
             else:
-                preview_img.source = ''
+                self.show_image_async(preview_img, '')
         filechooser.bind(selection=lambda inst, val: _on_sel())
 
         btn_row = BoxLayout(size_hint_y=None, height=44, spacing=8)
@@ -1286,30 +1870,10 @@ class SmartApp(App):
             if not completed and not next_day:
                 self.show_popup("Missing", "Enter details about completed work or next day plan.")
                 return
-            # save to DB
-            try:
-                conn = sqlite3.connect(DB_FILE); c = conn.cursor()
-                c.execute('''CREATE TABLE IF NOT EXISTS work_logs
-                             (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                              worker TEXT, completed TEXT, next_day TEXT, photo TEXT, created_at TEXT)''')
-                now = datetime.now().isoformat()
-                c.execute('INSERT INTO work_logs (worker, completed, next_day, photo, created_at) VALUES (?,?,?,?,?)',
-                          (worker, completed, next_day, photo_path, now))
-                conn.commit(); conn.close()
-            except Exception as e:
-                print("Saving work log to DB failed:", e)
-                self.show_popup("Error", "Failed to save work log to database.")
-                return
-            # append to CSV for ML / records
-            try:
-                write_header = not os.path.exists(WORKLOGS_CSV)
-                with open(WORKLOGS_CSV, 'a', newline='', encoding='utf-8') as f:
-                    w = csv.writer(f)
-                    if write_header:
-                        w.writerow(['created_at','worker','completed','next_day','photo'])
-                    w.writerow([now, worker, completed, next_day, photo_path])
-            except Exception as e:
-                print("Append work log CSV failed:", e)
+            # queue for the batched DB + CSV writer
+            now = datetime.now().isoformat()
+            self._pending_logs.append(((worker, completed, next_day, photo_path, now),
+                                       [now, worker, completed, next_day, photo_path]))
             self.show_popup("Saved", "Work log saved.")
             pop.dismiss()
             # reset current image to avoid accidental reuse
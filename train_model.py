@@ -2,71 +2,177 @@
 # Hybrid trainer: prefer real data (data/records.csv). If too few rows, augment with synthetic samples.
 # Produces models/model.joblib and models/sample_training_data.csv
 import os
+import hashlib
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor #ml library multiple decision tree 
-from sklearn.preprocessing import OneHotEncoder #categorical data to numeical convert
-from sklearn.compose import ColumnTransformer  #-- pipeline add
-from sklearn.pipeline import Pipeline # -- pipeline 
+from sklearn.ensemble import HistGradientBoostingRegressor #ml library histogram-binned boosted trees
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, r2_score
 import joblib
 
+# Optional: LightGBM's GBDT (sklearn's HistGradientBoosting is used if it's missing)
+try:
+    from lightgbm import LGBMRegressor
+except ImportError:
+    LGBMRegressor = None
+
+# Optional: Polars parses records.csv on all cores (chunked pandas reader if missing)
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# Optional: pyarrow's multithreaded CSV writer for the sample dump (pandas to_csv if missing)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+# Optional: lz4 for a fast-to-decompress model file (zlib level 3 if missing)
+try:
+    import lz4  # noqa: F401  (joblib only needs it importable)
+    MODEL_COMPRESS = ('lz4', 3)
+except ImportError:
+    MODEL_COMPRESS = 3
+
 os.makedirs('models', exist_ok=True)
 os.makedirs('data', exist_ok=True)
 
 MIN_REAL = 100     # if real rows < MIN_REAL, augment with synthetic data
 TARGET_SIZE = 2000 # total rows after augmentation (approx)
+CSV_CHUNK_ROWS = 100_000 # rows parsed per chunk when reading records.csv
+
+# services the model knows; a service's feature value is its index here (anything else is -1).
+# Starts as the app's service options (main.py's estimate spinner); any other service found in
+# records.csv is appended when the real data is loaded.
+APP_SERVICES = ['Painting','Plumbing','Tiles','Carpentry','AC Service','Renovation','Electrical']
+SERVICES = list(APP_SERVICES)
+SERVICE_CODES = {svc: i for i, svc in enumerate(SERVICES)}
+MAX_SERVICES = 64   # HistGradientBoosting allows at most max_bins (64) categories
+
+# services the synthetic generator prices (no Electrical model), and their parameters, indexed alike
+SYN_SERVICES = APP_SERVICES[:6]
+SYN_SEED = 42
+SYN_VERSION = 1   # bump when the synthetic rows change in a way the cache key can't see
+SYN_P = [0.35, 0.15, 0.2, 0.1, 0.1, 0.1]
+SYN_AREA_LOC = np.array([50, 10, 50, 10, 10, 50], dtype=float)
+SYN_MAT_M2 = np.array([12 * 1.0, 0, 600 * 1.05, 150, 0, 200])   # material per m²
+SYN_MAT_PT = np.array([0, 200, 0, 0, 0, 0])                      # material per plumbing point
+SYN_LAB_BASE = np.array([0, 500, 0, 0, 900, 0])                  # fixed labour
+SYN_LAB_M2 = np.array([30, 0, 50, 80, 0, 120])                   # labour per m²
+SYN_LAB_PT = np.array([0, 300, 0, 0, 0, 0])                      # labour per plumbing point
 
 def make_synthetic_rows(n):
-    rng = np.random.RandomState(42)
-    services = ['Painting','Plumbing','Tiles','Carpentry','AC Service','Renovation']
-    rows = []
-    for _ in range(n):
-        svc = rng.choice(services, p=[0.35,0.15,0.2,0.1,0.1,0.1])
-        area = float(max(0.0, rng.normal(loc=50 if svc in ['Painting','Tiles','Renovation'] else 10, scale=30)))
-        points = int(rng.poisson(1) if svc=='Plumbing' else 0)
-        image_flag = int(rng.choice([0,1], p=[0.8,0.2]))
-        if svc == 'Painting':
-            material = area * 12 * 1.0
-            labour = area * 30
-        elif svc == 'Tiles':
-            material = area * 600 * 1.05
-            labour = area * 50
-        elif svc == 'Plumbing':
-            material = points * 200
-            labour = 500 + points * 300
-        elif svc == 'Carpentry':
-            material = area * 150
-            labour = area * 80
-        elif svc == 'AC Service':
-            material = 0
-            labour = 900
-        else: # Renovation
-            material = area * 200
-            labour = area * 120
-        noise = rng.normal(0, 0.05 * (material + labour))
-        total = float(max(100, material + labour + noise + (100 if image_flag else 0)))
-        rows.append([svc, area, points, image_flag, total])
-    return pd.DataFrame(rows, columns=['service','area','points','image','total'])
+    # vectorised: every column is drawn for all n rows at once, coefficients looked up by service index
+    rng = np.random.default_rng(SYN_SEED)   # PCG64: faster than the legacy RandomState MT19937 for bulk draws
+    svc_idx = rng.choice(len(SYN_SERVICES), size=n, p=SYN_P)
+    area = np.maximum(0.0, rng.normal(loc=SYN_AREA_LOC[svc_idx], scale=30))
+    points = np.where(svc_idx == SYN_SERVICES.index('Plumbing'), rng.poisson(1, size=n), 0)
+    image_flag = (rng.random(n) < 0.2).astype(np.int8)   # 20% of quotes come with a photo
+    material = area * SYN_MAT_M2[svc_idx] + points * SYN_MAT_PT[svc_idx]
+    labour = SYN_LAB_BASE[svc_idx] + area * SYN_LAB_M2[svc_idx] + points * SYN_LAB_PT[svc_idx]
+    noise = rng.normal(0, 0.05 * (material + labour))
+    total = np.maximum(100, material + labour + noise + 100 * image_flag)
+    # pre-typed columns, same narrow dtypes as the real-data load path; service stays as its
+    # index codes (a Categorical) instead of n boxed strings
+    return pd.DataFrame({'service': pd.Categorical.from_codes(svc_idx, categories=SYN_SERVICES),
+                         'area': area.astype(np.float32), 'points': points.astype(np.int32),
+                         'image': image_flag.astype(np.int8), 'total': total.astype(np.float32)},
+                        copy=False)
+
+def encode(frame, dtype):
+    # the model's input matrix in one allocation: [service_code, area, points, image],
+    # the same row main.py builds from `service_codes_` (unknown services -> -1)
+    out = np.empty((len(frame), 4), dtype=dtype)
+    # same lookup as main.py's _model_rows: codes.get(svc, -1)
+    out[:, 0] = frame['service'].map(SERVICE_CODES).astype('float64').fillna(-1).to_numpy()
+    out[:, 1] = frame['area'].to_numpy()
+    out[:, 2] = frame['points'].to_numpy()
+    out[:, 3] = frame['image'].to_numpy()
+    return out
+
+def _code_fingerprint(fn, seen=None):
+    # bytecode + constants of fn and of every module-level function it calls (recursively)
+    seen = set() if seen is None else seen
+    seen.add(fn)
+    code = fn.__code__
+    parts = [code.co_code, repr(code.co_consts).encode()]
+    for name in code.co_names:
+        dep = globals().get(name)
+        if callable(dep) and hasattr(dep, '__code__') and dep not in seen:
+            parts.append(_code_fingerprint(dep, seen))
+    return b''.join(parts)
+
+def synthetic_rows_cached(n):
+    # make_synthetic_rows is deterministic for (n, seed, generator code + parameters), so its output is
+    # kept in data/ as Parquet and reloaded on the next run. The key covers the generator and every
+    # helper it calls, the SYN_* parameters and NumPy's version; bump SYN_VERSION for anything else
+    # that changes the rows
+    key = hashlib.sha1(repr((SYN_VERSION, np.__version__, SYN_SERVICES, SYN_P)).encode()
+                       + _code_fingerprint(make_synthetic_rows)
+                       + np.stack([SYN_AREA_LOC, SYN_MAT_M2, SYN_MAT_PT,
+                                   SYN_LAB_BASE, SYN_LAB_M2, SYN_LAB_PT]).tobytes()).hexdigest()[:12]
+    cache = os.path.join('data', f'_synth_{n}_{SYN_SEED}_{key}.parquet')
+    if os.path.exists(cache):
+        try:
+            return pd.read_parquet(cache)
+        except Exception as e:
+            print("Synthetic cache unreadable, regenerating:", e)
+    rows = make_synthetic_rows(n)
+    try:
+        rows.to_parquet(cache, compression='snappy', index=False)
+    except ImportError:
+        pass   # no parquet engine (pyarrow / fastparquet): just don't cache
+    except Exception as e:
+        print("Could not cache synthetic rows:", e)
+    return rows
 
 # 1) Load real data if present
 real_path = os.path.join('data','records.csv')
 if os.path.exists(real_path):
     try:
-        df_real = pd.read_csv(real_path)
-        # keep only required columns if they exist
         expected = ['service','area','points','image','total']
-        df_real = df_real[[c for c in expected if c in df_real.columns]].copy()
-        # ensure columns exist
-        for c in expected:
-            if c not in df_real.columns:
-                df_real[c] = 0
-        # coerce types
-        df_real['area'] = pd.to_numeric(df_real['area'], errors='coerce').fillna(0.0)
-        df_real['points'] = pd.to_numeric(df_real['points'], errors='coerce').fillna(0).astype(int)
-        df_real['image'] = pd.to_numeric(df_real['image'], errors='coerce').fillna(0).astype(int)
-        df_real['total'] = pd.to_numeric(df_real['total'], errors='coerce').fillna(df_real['total'].median() if not df_real['total'].empty else 0.0)
+        if pl is not None:
+            # parallel parse with the column projection pushed down; everything is read as text and cast
+            # leniently (bad values -> null), which matches pd.to_numeric(errors='coerce') below
+            header = pl.read_csv(real_path, n_rows=0).columns
+            frame = pl.read_csv(real_path, columns=[c for c in expected if c in header], infer_schema_length=0)
+            num = {c: pl.col(c).cast(pl.Float32, strict=False) if c in header else pl.lit(0.0, pl.Float32)
+                   for c in expected[1:]}
+            frame = frame.select(
+                pl.col('service') if 'service' in header else pl.lit('0').alias('service'),
+                num['area'].fill_null(0).alias('area'),
+                num['points'].fill_null(0).cast(pl.Int32).alias('points'),
+                num['image'].fill_null(0).cast(pl.Int8).alias('image'),
+                num['total'].alias('total'))
+            # straight to NumPy-backed columns (to_pandas() would need pyarrow)
+            df_real = pd.DataFrame({c: frame[c].to_numpy() for c in expected})
+        else:
+            # stream the file in chunks, parsing only the required columns, so a large log stays bounded in memory
+            chunks = []
+            for chunk in pd.read_csv(real_path, usecols=lambda c: c in expected, chunksize=CSV_CHUNK_ROWS):
+                # ensure columns exist
+                for c in expected:
+                    if c not in chunk.columns:
+                        chunk[c] = 0
+                # coerce types (narrow dtypes: float32 / int32 / int8 are plenty for these features)
+                chunk['area'] = pd.to_numeric(chunk['area'], errors='coerce', downcast='float').fillna(np.float32(0)).astype(np.float32)
+                chunk['points'] = pd.to_numeric(chunk['points'], errors='coerce').fillna(0).astype(np.int32)
+                chunk['image'] = pd.to_numeric(chunk['image'], errors='coerce').fillna(0).astype(np.int8)
+                chunk['total'] = pd.to_numeric(chunk['total'], errors='coerce', downcast='float')
+                chunks.append(chunk[expected])
+            df_real = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=expected)
+        # missing totals take the median over the whole file, not per chunk
+        df_real['total'] = df_real['total'].fillna(df_real['total'].median() if not df_real['total'].empty else 0.0).astype(np.float32)
+        # services recorded in records.csv but not offered by the app get their own codes too
+        for svc in pd.unique(df_real['service'].dropna()):
+            if isinstance(svc, str) and svc and svc not in SERVICE_CODES:
+                if len(SERVICES) >= MAX_SERVICES:
+                    print(f"Too many distinct services; '{svc}' and later ones are encoded as unknown.")
+                    break
+                SERVICE_CODES[svc] = len(SERVICES)
+                SERVICES.append(svc)
         print(f"Loaded real records: {len(df_real)} rows from {real_path}")
     except Exception as e:
         print("Failed to read real records:", e)
@@ -83,46 +189,74 @@ if n_real >= MIN_REAL:
 else:
     need = max(0, TARGET_SIZE - n_real)
     print(f"Only {n_real} real rows found (< {MIN_REAL}). Augmenting with {need} synthetic rows to reach ~{TARGET_SIZE}.")
-    df_synth = make_synthetic_rows(need)
-    # concat real first so model sees real examples; then synthetic
-    df = pd.concat([df_real, df_synth], ignore_index=True)
+    df_synth = synthetic_rows_cached(need)
+    # real rows first so model sees real examples; then synthetic. Each column is joined with one
+    # np.concatenate into its final array (both frames carry the same narrow dtypes; service labels
+    # become plain objects); an empty real frame is untyped, so it's skipped
+    if n_real:
+        df = pd.DataFrame({c: np.concatenate([df_real[c].to_numpy(dtype=object if c == 'service' else None),
+                                              df_synth[c].to_numpy(dtype=object if c == 'service' else None)])
+                           for c in df_synth.columns}, copy=False)
+    else:
+        df = df_synth
     print(f"Training rows: {len(df)} (real: {n_real}, synthetic: {len(df_synth)})")
 
 # sanity clean: drop any rows with missing total
 df = df.dropna(subset=['total'])
 df = df.reset_index(drop=True)
 
-# 3) prepare features and pipeline
-X = df[['service','area','points','image']]
-y = df['total']
-
-categorical_features = ['service']
-numeric_features = ['area','points','image']
+# 3) prepare features and model
+# service is one integer-coded categorical column (no one-hot expansion); the matrix is built in the
+# dtype the trainer reads natively (LightGBM takes float32 as-is; sklearn's HistGradientBoosting
+# would copy float32 up to float64)
+X_DTYPE = np.float32 if LGBMRegressor is not None else np.float64
+X = encode(df, X_DTYPE)
+y = df['total'].to_numpy(dtype=np.float64)
 
-preprocessor = ColumnTransformer(
-    transformers=[
-        ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features),
-    ],
-    remainder='passthrough'  # keep numeric as-is
-)
-
-pipeline = Pipeline([
-    ('pre', preprocessor),
-    ('model', RandomForestRegressor(n_estimators=150, random_state=42, n_jobs=-1))
-])
+# small, shallow ensembles: fit and per-request predict cost grow with trees x depth, and on
+# ~2000 rows / 4 features 100 depth-6 trees validate as well as 300 unbounded ones
+if LGBMRegressor is not None:
+    model = LGBMRegressor(n_estimators=100, num_leaves=31, max_depth=6, min_child_samples=10,
+                          learning_rate=0.1, n_jobs=-1, objective='regression', random_state=42, verbose=-1)
+    fit_params = {'categorical_feature': [0]}
+else:
+    print("lightgbm not installed; using HistGradientBoostingRegressor.")
+    # features are binned once into <= 64 uint8 bins; service (column 0) is split as a native categorical
+    model = HistGradientBoostingRegressor(max_iter=100, max_depth=6, min_samples_leaf=10, learning_rate=0.1,
+                                          max_bins=64, categorical_features=[0], random_state=42)
+    fit_params = {}
 
 # 4) train / evaluate
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.18, random_state=42)
+# stratified on the service code so minority services (AC, Carpentry, ...) are represented in the
+# validation fold in proportion. Stratifying needs at least 2 rows of every service and both folds
+# at least as large as the number of services (sizes as train_test_split computes them)
+TEST_SIZE = 0.18
+_, svc_counts = np.unique(X[:, 0], return_counts=True)
+n_test = int(np.ceil(TEST_SIZE * len(X)))
+n_train = len(X) - n_test
+strata = X[:, 0] if svc_counts.min() >= 2 and len(svc_counts) <= min(n_test, n_train) else None
+X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=42, stratify=strata)
 print(f"Training on {len(X_train)} rows; validating on {len(X_test)} rows...")
-pipeline.fit(X_train, y_train)
-y_pred = pipeline.predict(X_test)
+model.fit(X_train, y_train, **fit_params)
+model.service_codes_ = SERVICE_CODES   # tells main.py to feed NumPy rows instead of a DataFrame
+# the whole fold in one predict call, as a contiguous X_DTYPE matrix
+X_test = np.ascontiguousarray(X_test, dtype=X_DTYPE)
+y_pred = model.predict(X_test)
 mae = mean_absolute_error(y_test, y_pred)
 r2 = r2_score(y_test, y_pred)
 print(f"Validation MAE: {mae:.2f}   R2: {r2:.4f}")
 
 # 5) save model & sample data
-joblib.dump(pipeline, os.path.join('models','model.joblib'))
+# compressed with pickle protocol 5; joblib.load in main.py decompresses transparently
+joblib.dump(model, os.path.join('models','model.joblib'), compress=MODEL_COMPRESS, protocol=5)
 print("Saved model to models/model.joblib")
 # save a small sample of training data for inspection
-df.sample(min(200, len(df))).to_csv(os.path.join('models','sample_training_data.csv'), index=False)
+sample = df.sample(min(200, len(df)))
+sample_path = os.path.join('models','sample_training_data.csv')
+if pa is not None:
+    # service may be a Categorical (synthetic rows); write its labels as plain strings
+    sample = sample.astype({'service': str})
+    pacsv.write_csv(pa.Table.from_pandas(sample, preserve_index=False), sample_path)
+else:
+    sample.to_csv(sample_path, index=False, lineterminator='\n')
 print("Saved sample training rows to models/sample_training_data.csv")